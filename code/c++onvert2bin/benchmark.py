@@ -0,0 +1,62 @@
+import resource
+import sys
+import time
+import numpy as np
+import pandas as pd
+from json2txt import split_draws, flatten
+
+# Regression benchmark for the readers of single column draws (NY, DC Keno, NH Keno).
+# Parsing and flattening has to stay linear in the number of draws, so the time
+# per draw on the largest input must stay close to the one on the small inputs.
+# By default draws of 6 picks like the lotto games and of 20 like the Keno games are
+# parsed, the peak memory of the process is printed after every size.
+# Run as: python benchmark.py [picks per draw ...]
+
+# Column of draws like "03 17 42 ...", written as bytes a million draws at a time
+# instead of one Python string per number
+def synthetic_column(draws, picks, rng, block=1_000_000):
+    parts = []
+    for start in range(0, draws, block):
+        numbers = np.sort(rng.integers(1, 81, size=(min(block, draws - start), picks), dtype=np.uint8), axis=1)
+        chars = np.full(numbers.shape + (3,), ord(' '), dtype=np.uint8)
+        chars[..., 0] = numbers // 10 + ord('0')
+        chars[..., 1] = numbers % 10 + ord('0')
+        rows = np.ascontiguousarray(chars.reshape(len(numbers), -1)[:, :-1]).view(f"S{3 * picks - 1}").ravel()
+        parts.append(pd.Series(rows.astype(str)))
+    return pd.concat(parts, ignore_index=True)
+
+def peak_memory():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024   # MB, Linux reports kB
+
+def measure(column, repeats=3):
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        flatten(*split_draws(column))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+if __name__ == "__main__":
+    shapes = [int(picks) for picks in sys.argv[1:]] or [6, 20]
+    sizes = [10_000, 100_000, 1_000_000, 10_000_000]
+    tolerance = 3   # allowed growth of the time per draw between the smallest and largest size
+
+    rng = np.random.default_rng(0)
+    failed = []
+    for picks in shapes:
+        per_draw = []
+        for draws in sizes:
+            column = synthetic_column(draws, picks, rng)
+            seconds = measure(column, repeats=1 if draws >= 10_000_000 else 3)
+            per_draw.append(seconds / draws)
+            print(f"{picks:>2} picks, {draws:>10} draws: {seconds:8.3f} s, {per_draw[-1] * 1e9:7.1f} ns per draw, "
+                  f"peak memory {peak_memory():6.0f} MB")
+            del column
+
+        growth = per_draw[-1] / min(per_draw)
+        print(f"{picks:>2} picks: time per draw grew {growth:.2f}x from {sizes[0]} to {sizes[-1]} draws")
+        if growth > tolerance:
+            failed.append(picks)
+
+    if failed:
+        sys.exit(f"Scaling is not linear for {failed} picks, more than {tolerance}x growth of the time per draw")
@@ -0,0 +1,113 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+from json2txt import registry, mixes, load, per_year, select, existing
+from packing import modes, bit_modes, number_bits
+
+# Byte budget of the packed diehard inputs: how many bytes a selection of datasets
+# packs into with a mode and bit width, and which Diehard tests these are enough for,
+# without packing anything. Only the counts of every number of a dataset are needed,
+# taken from the cache of parsed datasets (see cache.py), and packing.number_bits()
+# gives the bits each of them takes in the stream. This way the size of a corpus of
+# many DC Keno or NY Quick Draw years is known before spending time on packing it:
+#   python code/c++onvert2bin/budget.py --dc-keno 2015 2016 2017 --quick-draw 2023
+#
+# The selections are the mixes of json2txt.py and the groups of the packed files
+# diehard.runner reads, named like them. The table is written to budget_path for
+# plot_test_requirements() in diehard_graphs.py. The table of the datasets of the
+# repository is kept there with them, so write it again when they change.
+
+budget_path = "data/diehard_budget.csv"
+
+# Bytes every test of the C diehard reads from its input
+requirements = {
+    "Birthday":             2048000,
+    "Overlapping 5-Perms":  8011776,
+    "Binary rank 31x31":    4964352,
+    "Binary rank 32x32":    5128192,
+    "Binary rank 6x8":      2408448,
+    "Bitstream":            5259264,
+    "Monkey OPSO":          8404992,
+    "Monkey OQSO":          8404992,
+    "Monkey DNA":           8404992,
+    "Count 1s":             1032192,
+    "Parking":               966656,
+    "Mindist":              6406144,
+    "3D spheres":            966656,
+    "Squeeze":              8306688,
+    "Overlapping sums":      802816,
+    "Runs":                  802816,
+    "Craps":                5832704
+}
+
+# Datasets packed together, by the name of the packed file
+def selections(datasets=registry):
+    return {
+        **{mix: [d for d in datasets if d["order"] == order] for order, mix in mixes.items()},
+        "JointLotteries": [d for d in datasets if not per_year(d)],
+        "DC_Keno": [d for d in datasets if d["name"].startswith("DC_Keno_")],
+        "NY_Quick_Draw": [d for d in datasets if d["name"].startswith("NY_Quick_Draw_")]
+    }
+
+# Counts of every number 0-255 of the dataset
+def histogram(dataset, cache_dir="data/cache"):
+    return np.bincount(load(dataset, cache_dir), minlength=256)
+
+# Bits and numbers every selection packs into, the counts of every dataset taken once
+# even when it is part of several selections
+def available(selections, mode="txt2bin", bits=None, cache_dir="data/cache"):
+    counts, rows = {}, []
+    for name, datasets in selections.items():
+        total_bits, numbers = 0, 0
+        for dataset in datasets:
+            if dataset["name"] not in counts:
+                counts[dataset["name"]] = histogram(dataset, cache_dir)
+            total_bits += int(counts[dataset["name"]] @ number_bits(dataset["range"], mode, bits))
+            numbers += int(counts[dataset["name"]].sum())
+        rows.append({"selection": name, "datasets": len(datasets), "numbers": numbers,
+                     "bits": total_bits, "bytes": total_bits // 8})
+    return pd.DataFrame(rows, columns=["selection", "datasets", "numbers", "bits", "bytes"])
+
+# One row per selection and test, with the bytes available and required
+def plan(selections, mode="txt2bin", bits=None, cache_dir="data/cache", tests=requirements):
+    sizes = available(selections, mode, bits, cache_dir)
+    required = pd.DataFrame({"test": list(tests), "required": list(tests.values())})
+    table = sizes.merge(required, how="cross")
+    table["runnable"] = table["bytes"] >= table["required"]
+    return table
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=modes, default="txt2bin", help="packing mode, see json2txt.py")
+    parser.add_argument("--bits", type=int, help="bits per number for the raw and reject modes")
+    parser.add_argument("--dc-keno", nargs="+", type=int, metavar="YEAR",
+                        help="years of DC Keno instead of the ones in the registry")
+    parser.add_argument("--quick-draw", nargs="+", type=int, metavar="YEAR",
+                        help="years of NY Quick Draw instead of the ones in the registry")
+    parser.add_argument("--match", default="*",
+                        help="only count the datasets whose path matches this pattern")
+    parser.add_argument("--sources", action="store_true",
+                        help="also report every dataset on its own")
+    parser.add_argument("--cache", default="data/cache",
+                        help="directory caching the parsed datasets, see cache.py")
+    parser.add_argument("--out", default=budget_path, help="CSV file the table is written to")
+    args = parser.parse_args()
+    if args.bits and args.mode not in bit_modes:
+        parser.error(f"--bits only applies to --mode {' or '.join(bit_modes)}")
+
+    datasets = existing(select(registry, args.dc_keno, args.quick_draw, args.match))
+
+    chosen = selections(datasets)
+    if args.sources:
+        chosen.update({d["name"]: [d] for d in datasets})
+    table = plan(chosen, args.mode, args.bits, args.cache)
+
+    with pd.option_context("display.max_rows", None, "display.max_columns", None, "display.width", 250):
+        print(table.drop_duplicates("selection")[["selection", "datasets", "numbers", "bytes"]].to_string(index=False))
+        runnable = table.pivot(index="selection", columns="test", values="runnable")
+        print(runnable.reindex(index=list(chosen), columns=list(requirements))
+              .apply(lambda column: column.map({True: "yes", False: "-"})))
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    table.to_csv(args.out, index=False)
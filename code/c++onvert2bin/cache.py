@@ -0,0 +1,79 @@
+import hashlib
+import json
+import os
+import numpy as np
+from validation import read_baseline
+
+# Cache of parsed datasets. The numbers of every dataset are stored as {name}.npy
+# next to {name}.json, which records the dataset spec and the size, modification
+# time and SHA-256 of the source file, and the validation baseline of the dataset
+# (see validation.py), as the numbers cached are the draws that passed validation.
+# An entry is used when the spec and the baseline are unchanged and the source
+# either has the same size and mtime or, failing that, the same hash.
+
+def sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def source_info(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+# The spec as it would be written to and read back from json
+def spec_key(dataset):
+    return json.loads(json.dumps(dataset))
+
+# Returns the cached numbers of the dataset, memory mapped, or None if the entry is
+# missing or outdated. An entry whose source only got touched is refreshed in place.
+def lookup(dataset, cache_dir):
+    name = dataset["name"]
+    meta_path = os.path.join(cache_dir, f"{name}.json")
+    data_path = os.path.join(cache_dir, f"{name}.npy")
+    if not os.path.exists(meta_path) or not os.path.exists(data_path):
+        return None
+
+    with open(meta_path) as f:
+        meta = json.load(f)
+    if meta["spec"] != spec_key(dataset) or meta.get("baseline") != baseline_key(dataset):
+        return None
+
+    info = source_info(dataset["path"])
+    if (meta["size"], meta["mtime"]) != (info["size"], info["mtime"]):
+        if meta["sha256"] != sha256(dataset["path"]):
+            return None
+        meta.update(info)
+        with open(meta_path, "w") as f:
+            json.dump(meta, f, indent=4)
+
+    return np.load(data_path, mmap_mode="r")
+
+def baseline_key(dataset):
+    return read_baseline().get(dataset["name"], {})
+
+def describe(dataset):
+    return {
+        "spec": spec_key(dataset),
+        "baseline": baseline_key(dataset),
+        **source_info(dataset["path"]),
+        "sha256": sha256(dataset["path"])
+    }
+
+# Meta data is taken before parsing, so a source changing in the meantime is parsed again next time
+def store(dataset, numbers, cache_dir, meta):
+    os.makedirs(cache_dir, exist_ok=True)
+    name = dataset["name"]
+
+    np.save(os.path.join(cache_dir, f"{name}.npy"), np.asarray(numbers))
+    with open(os.path.join(cache_dir, f"{name}.json"), "w") as f:
+        json.dump(meta, f, indent=4)
+
+def cached(dataset, read, cache_dir):
+    numbers = lookup(dataset, cache_dir)
+    if numbers is None:
+        meta = describe(dataset)
+        numbers = read(dataset)
+        store(dataset, numbers, cache_dir, meta)
+    return numbers
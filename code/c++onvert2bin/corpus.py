@@ -0,0 +1,207 @@
+import argparse
+import json
+import os
+import numpy as np
+import pandas as pd
+from fnmatch import fnmatch
+from json2txt import registry, select, existing, read_table, flatten
+from packing import modes, bit_modes, number_bits, stream_writer
+from validation import validate
+
+# Packed diehard input of many datasets in one file, indexed so that any source, years
+# of it or range of its draws can be tested without packing a file for it. The draws
+# of every dataset are split by the year of their date, like the per-year files of
+# DC Keno and NY Quick Draw, and every year of every dataset is packed on its own as
+# a segment (see packing.stream_writer) that starts at a byte. The segments follow
+# each other without gaps, in registry order and by year, so the years of one source
+# are one run of bytes. Draws without date are in the segment of year -1.
+#
+# Layout, all integers little endian:
+#   0       magic b"LOTTOPAK"
+#   8       uint64 offset and uint64 length of the index
+#   24      payload, the bytes of all segments
+#           uint64 checkpoints, 8 byte aligned
+#           index, JSON
+# The index records the mode and bits of the payload and for every segment its source,
+# year, dates, draws, numbers, first byte in the payload and bytes. The checkpoints are
+# the bit of the payload at which every stride-th draw of a segment starts, and the end
+# of the segment, so draw ranges are cut at multiples of stride draws, at the bytes
+# fully inside them.
+#
+# Readers map the file once with np.memmap, and a selection that is one run of bytes
+# is a view of the map, no bytes are copied:
+#   words = packed_corpus("data/corpus/corpus.pak").words("DC_Keno_2020")
+# Built from the repository root with
+#   python code/c++onvert2bin/corpus.py build data/corpus/corpus.pak --dc-keno 2020 2023
+# and tested with the NumPy diehard, e.g. DC Keno draws of 2020 only:
+#   PYTHONPATH=code python code/c++onvert2bin/corpus.py test data/corpus/corpus.pak \
+#       --source 'DC_Keno_*' --years 2020 --tests Birthday Parking
+
+magic = b"LOTTOPAK"
+header_bytes = 24
+corpus_path = "data/corpus/corpus.pak"
+
+# Rows of every year of the dataset, -1 for the draws without date
+def years(dates):
+    year = np.asarray(pd.DatetimeIndex(dates).year.fillna(-1), dtype=int)
+    return {int(y): np.flatnonzero(year == y) for y in np.unique(year)}
+
+def date_range(dates):
+    dates = pd.DatetimeIndex(dates).dropna()
+    return (str(dates.min().date()), str(dates.max().date())) if len(dates) else (None, None)
+
+# Draws, picks and dates of the dataset that the readers keep
+def valid_draws(dataset):
+    draws, picks, dates = read_table(dataset)
+    keep = validate(draws, picks, dataset)     # raises like the readers
+    return draws[keep], picks[keep], np.asarray(dates)[keep]
+
+# Packs every year of every dataset into out, see above
+def build(datasets, out, mode="txt2bin", bits=None, stride=64):
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    segments, checkpoints = [], []
+    with open(out + ".tmp", "wb") as f:
+        f.write(magic + bytes(header_bytes - len(magic)))
+        payload = 0
+        for dataset in datasets:
+            draws, picks, dates = valid_draws(dataset)
+            table = number_bits(dataset["range"], mode, bits)
+            filled = np.arange(draws.shape[1]) < picks[:, None]
+            for year, rows in years(dates).items():
+                # bits of every draw, to know where every stride-th of them starts
+                draw_bits = np.where(filled[rows], table[draws[rows]], 0).sum(axis=1)
+                starts = 8 * payload + np.concatenate(([0], np.cumsum(draw_bits)))
+                marks = np.append(starts[:-1][::stride], starts[-1])
+
+                writer = stream_writer(f, mode, bits)
+                writer.write(flatten(draws[rows], picks[rows]), dataset["range"])
+                first, last = date_range(dates[rows])
+                segments.append({
+                    "source": dataset["name"],
+                    "year": year,
+                    "first_date": first,
+                    "last_date": last,
+                    "draws": len(rows),
+                    "numbers": int(picks[rows].sum()),
+                    "start": payload,
+                    "bytes": writer.written,
+                    "checkpoint": sum(map(len, checkpoints)),
+                    "checkpoints": len(marks)
+                })
+                checkpoints.append(marks)
+                payload += writer.written
+
+        f.write(bytes(-f.tell() % 8))
+        checkpoint_offset = f.tell()
+        f.write(np.concatenate(checkpoints or [[]]).astype("<u8").tobytes())
+        index = json.dumps({"mode": mode, "bits": bits, "stride": stride, "payload": header_bytes,
+                            "checkpoint_offset": checkpoint_offset, "segments": segments}).encode()
+        index_offset = f.tell()
+        f.write(index)
+        f.seek(len(magic))
+        f.write(np.array([index_offset, len(index)], dtype="<u8").tobytes())
+    os.replace(out + ".tmp", out)
+    return segments
+
+# A file written by build(), memory mapped
+class packed_corpus:
+    def __init__(self, path):
+        self.path = path
+        self.data = np.memmap(path, dtype=np.uint8, mode="r")
+        if self.data[:len(magic)].tobytes() != magic:
+            raise ValueError(f"{path} isn't a packed corpus")
+        index_offset, length = self.data[len(magic):header_bytes].view("<u8").tolist()
+        self.index = json.loads(self.data[index_offset:index_offset + length].tobytes())
+        self.segments = pd.DataFrame(self.index["segments"], columns=[
+            "source", "year", "first_date", "last_date", "draws", "numbers", "start", "bytes", "checkpoint", "checkpoints"])
+        start = self.index["checkpoint_offset"]
+        self.checkpoints = self.data[start:index_offset].view("<u8")
+        self.payload = self.data[self.index["payload"]:start]
+
+    # Segments of the sources matching the pattern, of the given years or all of them
+    def select(self, source="*", years=None):
+        rows = self.segments["source"].map(lambda name: fnmatch(name, source))
+        if years is not None:
+            rows &= self.segments["year"].isin(list(years))
+        return self.segments[rows]
+
+    # Bytes of the segment from the checkpoint at or before draw start up to the one at
+    # or after draw stop
+    def segment_bytes(self, segment, start=0, stop=None):
+        stride = self.index["stride"]
+        marks = self.checkpoints[segment.checkpoint:segment.checkpoint + segment.checkpoints]
+        stop = segment.draws if stop is None else min(stop, segment.draws)
+        first, last = int(marks[start // stride]), int(marks[min(-(-stop // stride), len(marks) - 1)])
+        first = segment.start if start == 0 else max(segment.start, -(-first // 8))
+        last = segment.start + segment.bytes if stop == segment.draws else min(segment.start + segment.bytes, last // 8)
+        return first, max(first, last)
+
+    # Bytes of the selected segments, draws start to stop of them counted over all of
+    # them in order. A view of the file when they are one run of bytes, else a copy.
+    def bytes(self, source="*", years=None, draws=None):
+        segments = self.select(source, years)
+        start, stop = draws or (0, None)
+        ranges, skipped = [], 0
+        for segment in segments.itertuples():
+            if stop is not None and skipped >= stop:
+                break
+            if skipped + segment.draws > start:
+                ranges.append(self.segment_bytes(segment, max(0, start - skipped),
+                                                 None if stop is None else stop - skipped))
+            skipped += segment.draws
+
+        if not ranges:
+            return self.payload[:0]
+        if all(end == begin for (_, end), (begin, _) in zip(ranges, ranges[1:])):
+            return self.payload[ranges[0][0]:ranges[-1][1]]
+        return np.concatenate([self.payload[begin:end] for begin, end in ranges])
+
+    # The same as uint32 words for the diehard tests, without the bytes not making up a last word
+    def words(self, source="*", years=None, draws=None):
+        data = self.bytes(source, years, draws)
+        return data[:len(data) // 4 * 4].view("<u4")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = commands.add_parser("build", help="pack the datasets into a corpus")
+    build_parser.add_argument("out", nargs="?", default=corpus_path)
+    build_parser.add_argument("--mode", choices=modes, default="txt2bin", help="packing mode, see json2txt.py")
+    build_parser.add_argument("--bits", type=int, help="bits per number for the raw and reject modes")
+    build_parser.add_argument("--dc-keno", nargs="+", type=int, metavar="YEAR",
+                              help="years of DC Keno instead of the ones in the registry")
+    build_parser.add_argument("--quick-draw", nargs="+", type=int, metavar="YEAR",
+                              help="years of NY Quick Draw instead of the ones in the registry")
+    build_parser.add_argument("--match", default="*", help="only pack the datasets whose path matches this pattern")
+    build_parser.add_argument("--stride", type=int, default=64, help="draws between the checkpoints of the index")
+
+    list_parser = commands.add_parser("list", help="print the index of a corpus")
+    list_parser.add_argument("path", nargs="?", default=corpus_path)
+
+    test_parser = commands.add_parser("test", help="run the NumPy diehard on a selection, needs PYTHONPATH=code")
+    test_parser.add_argument("path", nargs="?", default=corpus_path)
+    test_parser.add_argument("--source", default="*", help="sources matching this pattern")
+    test_parser.add_argument("--years", nargs="+", type=int, help="only these years of them")
+    test_parser.add_argument("--draws", nargs=2, type=int, metavar=("START", "STOP"),
+                             help="only these draws of the selection, cut at the checkpoints")
+    test_parser.add_argument("--tests", nargs="+", help="tests to run, all by default")
+    args = parser.parse_args()
+    if args.command == "build" and args.bits and args.mode not in bit_modes:
+        build_parser.error(f"--bits only applies to --mode {' or '.join(bit_modes)}")
+
+    if args.command == "build":
+        datasets = existing(select(registry, args.dc_keno, args.quick_draw, args.match))
+        build(datasets, args.out, args.mode, args.bits, args.stride)
+        print(f"Packed {len(datasets)} datasets into {args.out}")
+    elif args.command == "list":
+        corpus = packed_corpus(args.path)
+        with pd.option_context("display.max_rows", None, "display.width", 200):
+            print(corpus.segments.drop(columns=["checkpoint", "checkpoints"]).to_string(index=False))
+    else:
+        from diehard import battery
+
+        words = packed_corpus(args.path).words(args.source, args.years, args.draws)
+        print(f"{len(words)} words of {args.source}")
+        with pd.option_context("display.max_rows", None, "display.width", 200):
+            print(battery(words, args.tests))
@@ -0,0 +1,137 @@
+import argparse
+import numpy as np
+import pandas as pd
+from fnmatch import fnmatch
+from scipy.stats import chi2, norm
+from json2txt import registry, existing, read_table
+from uniformity import complete_rows
+
+# Tests of the draws of every game over time, to see when a game started to deviate
+# rather than whether it does over all of its draws. The draws are ordered by date and
+# tested in windows, either rolling ones of --window draws every --step draws or one
+# per calendar year, giving a series of p-values per game and statistic:
+#   frequency  chi-square of the counts of every number, as uniformity.frequency
+#   runs       Wald-Wolfowitz runs of draw sums above and below the median of the null
+#   sums       sum of all numbers in the window, normal with the exact null mean and
+#              variance of the sum of k out of n
+#
+# Windows aren't counted one by one. Each statistic is a sum over the draws of the
+# window, so the counts of a window are the cumulative counts at its end minus the
+# ones at its start: every draw gets added once when it enters and subtracted once
+# when it leaves, which makes all windows together O(N) instead of O(windows N).
+
+# Draws of the game that have a date, in the order of their dates
+def dated_draws(dataset):
+    draws, picks, dates = read_table(dataset)
+    rows, k = complete_rows(draws, picks, dataset)
+    rows &= ~np.isnat(np.asarray(dates, dtype="datetime64[ns]"))
+    order = np.argsort(np.asarray(dates)[rows], kind="stable")
+    draws = draws[rows, :k].astype(np.intp)[order] - dataset["range"][0]
+    return draws, pd.DatetimeIndex(np.asarray(dates)[rows][order])
+
+# Start and end rows of rolling windows of size draws every step draws
+def rolling(dates, size, step):
+    starts = np.arange(0, len(dates) - size + 1, step)
+    return starts, starts + size
+
+# Start and end rows of the draws of every year
+def yearly(dates):
+    _, starts = np.unique(dates.year, return_index=True)
+    return starts, np.append(starts[1:], len(dates))
+
+# Edges of the windows, and for every row the number of edges up to it, so the rows
+# before edges[j] are the ones numbered up to j
+def window_blocks(rows, starts, ends):
+    edges, index = np.unique(np.concatenate((starts, ends)), return_inverse=True)
+    return np.searchsorted(edges, np.arange(rows), side="right"), len(edges) + 1, index
+
+# Sums over the windows, from the totals of the rows between consecutive edges
+def window_totals(totals, index, windows):
+    cumulative = np.cumsum(totals, axis=0)
+    return cumulative[index[windows:]] - cumulative[index[:windows]]
+
+def window_sums(values, starts, ends):
+    block, blocks, index = window_blocks(len(values), starts, ends)
+    totals = np.bincount(block, weights=values, minlength=blocks).round().astype(np.int64)
+    return window_totals(totals, index, len(starts))
+
+# The counts of every number are taken column by column, to not hold N k indices at once
+def frequency(draws, size, starts, ends):
+    k = draws.shape[1]
+    block, blocks, index = window_blocks(len(draws), starts, ends)
+    totals = np.zeros(blocks * size, dtype=np.int64)
+    for column in draws.T:
+        totals += np.bincount(block * size + column, minlength=blocks * size)
+    counts = window_totals(totals.reshape(blocks, size), index, len(starts))
+
+    expected = (ends - starts)[:, None] * k / size
+    statistic = (size - 1) / (size - k) * ((counts - expected) ** 2 / expected).sum(axis=1)
+    return statistic, chi2.sf(statistic, size - 1)
+
+def runs(draws, size, starts, ends):
+    k = draws.shape[1]
+    above = (draws.sum(axis=1) > k * (size - 1) / 2).astype(np.int64)
+    changes = np.append(0, above[1:] != above[:-1]).astype(np.int64)
+    n1 = window_sums(above, starts, ends)
+    n2 = (ends - starts) - n1
+    # a change at the first row of a window is between it and the row before
+    runs = 1 + window_sums(changes, starts, ends) - changes[starts]
+
+    n = n1 + n2
+    mean = 2 * n1 * n2 / n + 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance = 2 * n1 * n2 * (2 * n1 * n2 - n) / (n ** 2 * (n - 1))
+        z = (runs - mean) / np.sqrt(variance)
+    return z, 2 * norm.sf(np.abs(z))
+
+def sums(draws, size, starts, ends):
+    k = draws.shape[1]
+    totals = window_sums(draws.sum(axis=1), starts, ends)
+    mean = k * (size - 1) / 2
+    variance = k * (size + 1) * (size - k) / 12
+    z = (totals - (ends - starts) * mean) / np.sqrt((ends - starts) * variance)
+    return z, 2 * norm.sf(np.abs(z))
+
+statistics = {
+    "frequency": frequency,
+    "runs": runs,
+    "sums": sums
+}
+
+# p-values of the statistics over the windows of the game, one row per window and statistic
+def drift(dataset, size=None, step=None, names=statistics):
+    draws, dates = dated_draws(dataset)
+    n = dataset["range"][1] - dataset["range"][0] + 1
+    starts, ends = yearly(dates) if size is None else rolling(dates, size, step)
+    if len(starts) == 0:
+        return pd.DataFrame()
+
+    windows = pd.DataFrame({"game": dataset["name"], "start": dates[starts], "end": dates[ends - 1],
+                            "draws": ends - starts})
+    frames = []
+    for name in names:
+        statistic, p = statistics[name](draws, n, starts, ends)
+        frames.append(windows.assign(statistic=name, value=statistic, p=p))
+    return pd.concat(frames, ignore_index=True)
+
+def run(datasets=registry, size=None, step=None, names=statistics):
+    frames = []
+    for dataset in existing(datasets):
+        frames.append(drift(dataset, size, step, names))
+    return pd.concat(frames, ignore_index=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--window", type=int, help="draws per rolling window, one window per year if not given")
+    parser.add_argument("--step", type=int, help="draws between the starts of rolling windows, by default a tenth of the window")
+    parser.add_argument("--statistics", nargs="+", choices=list(statistics), default=list(statistics))
+    parser.add_argument("--match", default="*", help="only test the datasets whose path matches this pattern")
+    parser.add_argument("--out", help="write the p-values to this CSV file")
+    args = parser.parse_args()
+
+    step = args.step or (args.window and max(1, args.window // 10))
+    results = run([d for d in registry if fnmatch(d["path"], args.match)], args.window, step, args.statistics)
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(results)
+    if args.out:
+        results.to_csv(args.out, index=False)
@@ -0,0 +1,100 @@
+import argparse
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from math import comb
+from scipy.stats import chi2
+from json2txt import registry, existing, read_table, ny_quick_draw
+
+# Minimum distance between the numbers of a draw, the d statistic of ny_test.R and
+# german_test.R. Their min_distance() loops over every row in R, here the gaps of all
+# draws are one np.diff over the draw matrix, so the whole 2013-2023 Quick Draw corpus
+# takes about as long to test as it takes to read it.
+#
+# For k numbers out of 1..n the null is exact, there are C(n - (k - 1)(i - 1), k)
+# draws with all gaps at least i, out of C(n, k).
+
+quick_draw_years = range(2013, 2024)
+
+# Smallest gap of every draw. The rows of ascending games are used as they are and
+# only the ones that aren't sorted, e.g. because of a bonus number, get sorted.
+def min_gaps(draws, ascending=False):
+    if not ascending:
+        return np.diff(np.sort(draws, axis=1).astype(np.intp), axis=1).min(axis=1)
+    gaps = np.diff(draws.astype(np.intp), axis=1).min(axis=1)
+    unsorted = np.flatnonzero(gaps < 0)
+    if len(unsorted):
+        gaps[unsorted] = np.diff(np.sort(draws[unsorted], axis=1).astype(np.intp), axis=1).min(axis=1)
+    return gaps
+
+# P(d = i) for i = 1, ..., (n - 1) // (k - 1), the largest possible gap
+@lru_cache(maxsize=None)
+def min_gap_probabilities(n, k):
+    top = (n - 1) // (k - 1)
+    at_least = [comb(n - (k - 1) * (i - 1), k) for i in range(1, top + 2)]
+    return np.array([(at_least[i] - at_least[i + 1]) / comb(n, k) for i in range(top)])
+
+# Merges cells from the end into the one before while they expect fewer than 5 counts
+def pool(observed, expected):
+    while len(expected) > 2 and expected[-1] < 5:
+        observed = np.append(observed[:-2], observed[-2:].sum())
+        expected = np.append(expected[:-2], expected[-2:].sum())
+    return observed, expected
+
+# Observed and expected counts of the gaps 1, 2, ..., pooled, ignoring gaps of 0
+# from draws with a repeated number
+def min_gap_cells(gaps, n, k):
+    probabilities = min_gap_probabilities(n, k)
+    observed = np.bincount(gaps[gaps > 0], minlength=len(probabilities) + 1)[1:]
+    return pool(observed, probabilities * observed.sum())
+
+def min_gap_test(gaps, n, k):
+    observed, expected = min_gap_cells(gaps, n, k)
+    statistic = ((observed - expected) ** 2 / expected).sum()
+    return statistic, len(expected) - 1, chi2.sf(statistic, len(expected) - 1)
+
+# Gaps of the main numbers of the draws of every dataset, the ones with all of them in
+# range, one array for all of them
+def dataset_gaps(datasets):
+    gaps, k = [], None
+    for dataset in existing(datasets):
+        draws, picks, _ = read_table(dataset)
+        k = dataset["main"]
+        draws = draws[picks >= k, :k]
+        draws = draws[((draws >= dataset["range"][0]) & (draws <= dataset["range"][1])).all(axis=1)]
+        gaps.append(min_gaps(draws, dataset["order"][0] == "A"))
+    return (np.concatenate(gaps) if gaps else np.zeros(0, dtype=np.intp)), k
+
+# Years as runs of consecutive years, e.g. 2013-2015+2018
+def year_runs(years):
+    runs = []
+    for year in sorted(years):
+        if runs and year == runs[-1][1] + 1:
+            runs[-1][1] = year
+        else:
+            runs.append([year, year])
+    return "+".join(str(first) if first == last else f"{first}-{last}" for first, last in runs)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", nargs="+", type=int, default=list(quick_draw_years),
+                        help="years of NY Quick Draw tested together")
+    args = parser.parse_args()
+
+    rows = []
+    games = [([dataset], dataset["name"]) for dataset in registry if dataset["order"][0] == "A"]
+    # pooled years named after the ones read, not tested again if that's one in the registry
+    pooled = existing([ny_quick_draw(year) for year in sorted(set(args.years))])
+    name = "NY_Quick_Draw_" + year_runs(int(d["name"].rsplit("_", 1)[1]) for d in pooled)
+    if pooled and name not in [game for _, game in games]:
+        games.append((pooled, name))
+    for datasets, name in games:
+        gaps, k = dataset_gaps(datasets)
+        if len(gaps) == 0 or k < 2:
+            continue
+        n = datasets[0]["range"][1] - datasets[0]["range"][0] + 1
+        statistic, df, p = min_gap_test(gaps, n, k)
+        rows.append({"game": name, "draws": len(gaps), "k": k, "n": n, "chisq": statistic, "df": df, "p": p})
+
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(pd.DataFrame(rows))
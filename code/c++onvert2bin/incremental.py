@@ -0,0 +1,147 @@
+import argparse
+import json
+import os
+import numpy as np
+from fnmatch import fnmatch
+from json2txt import registry, mixes, existing, read_table, flatten, new_rows, row_mark, start_mark
+from packing import modes, bit_modes, stream_writer
+from cooccurrence import count, counts_dir
+from validation import validate, read_baseline
+
+# Incremental counterpart of json2txt.py: appends only the draws added to the sources
+# since the last run to the text or packed output of a mix, and to the pair counts of
+# cooccurrence.py, whose diagonal holds the frequencies of the numbers.
+#
+# Only the output and the counts are incremental: every run still reads and parses
+# each source whole with json2txt.read_table(), as the new rows can only be told
+# apart from the old ones by comparing them with the mark of the rows read before.
+#
+# The manifest {out}.manifest.json records the settings the output was written with,
+# its length, the bits packed but not written yet because they don't complete a byte
+# (and the txt2bin carry, see packing.stream_writer), and for every dataset a mark of
+# the rows read (see json2txt.row_mark): how many, a hash of them and their last date.
+# New rows are found by json2txt.new_rows(), at the end of sources in date order and
+# at the top of newest-first ones such as UK Lotto or DC Keno.
+# The packed output is the same as packing the rows in the order they were read in
+# one stream, so new draws of every dataset follow the draws of all datasets before.
+#
+# New rows go through validation.validate() like in the readers, and any of them that
+# would be dropped stops the run.
+#
+# Appending twice is impossible: the output must have the length recorded in the
+# manifest (a longer one, left by a run that stopped before writing its manifest, is
+# cut back to it), an output without manifest isn't appended to, and a source whose
+# rows read before changed is an error asking for a rebuild rather than getting its
+# rows appended again.
+
+def manifest_path(out):
+    return out + ".manifest.json"
+
+def read_manifest(out, settings):
+    path = manifest_path(out)
+    if not os.path.exists(path):
+        if os.path.exists(out) and os.path.getsize(out) > 0:
+            raise ValueError(f"{out} exists without {path}, remove it to ingest from scratch")
+        return {**settings, "written": 0, "pending": "", "carry": "", "datasets": {}}
+
+    with open(path) as f:
+        manifest = json.load(f)
+    if {key: manifest[key] for key in settings} != settings:
+        raise ValueError(f"{out} was written with {({key: manifest[key] for key in settings})}, "
+                         f"remove it and {path} to rebuild it with {settings}")
+
+    size = os.path.getsize(out) if os.path.exists(out) else 0
+    if size < manifest["written"]:
+        raise ValueError(f"{out} is shorter than the {manifest['written']} bytes in {path}, rebuild it")
+    if size > manifest["written"]:
+        print(f"Cutting {out} back to {manifest['written']} bytes, a run before stopped before its manifest")
+        os.truncate(out, manifest["written"])
+    return manifest
+
+def write_manifest(out, manifest):
+    path = manifest_path(out)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=4)
+    os.replace(path + ".tmp", path)
+
+def bit_string(bits):
+    return "".join(map(str, bits.tolist()))
+
+def from_bit_string(text):
+    return np.array([int(c) for c in text], dtype=np.uint8)
+
+# Appends the new rows of the datasets, in registry order, to out: packed with mode
+# and bits, or as text with one number per line if mode is None. Returns the number
+# of new draws of every dataset.
+def ingest(datasets, out, mode=None, bits=None, counts=counts_dir):
+    manifest = read_manifest(out, {"mode": mode, "bits": bits})
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    if not os.path.exists(manifest_path(out)):
+        write_manifest(out, manifest)   # so an output left by a failing first run is cut back too
+
+    added = {}
+    with open(out, "ab") as f:
+        writer = stream_writer(f, mode, bits) if mode else None
+        if writer:
+            writer.pending, writer.carry = from_bit_string(manifest["pending"]), from_bit_string(manifest["carry"])
+
+        for dataset in existing(datasets):
+            mark = manifest["datasets"].get(dataset["name"], start_mark)
+            table = read_table(dataset)
+            rows = new_rows(dataset, *table, mark)
+            manifest["datasets"][dataset["name"]] = row_mark(*table)
+            draws, picks = table[0][rows], table[1][rows]
+            added[dataset["name"]] = len(rows)
+            if len(rows) == 0:
+                continue
+
+            # rows dropped before are in the baseline, new ones must all be valid
+            known = read_baseline().get(dataset["name"], {})
+            if mark["rows"] > 0:
+                known = {"duplicates": known.get("duplicates", 0)}
+            keep = validate(draws, picks, dataset, {dataset["name"]: known})
+            numbers = flatten(draws[keep], picks[keep])
+            if writer:
+                writer.write(numbers, dataset["range"])
+            else:
+                f.write("".join(f"{number}\n" for number in numbers.tolist()).encode())
+            if counts:
+                count(dataset, path=counts, table=table)
+
+        if writer:
+            manifest["pending"], manifest["carry"] = bit_string(writer.pending), bit_string(writer.carry)
+        f.flush()
+        manifest["written"] = f.tell()
+
+    write_manifest(out, manifest)
+    return added
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="append the draws added to the sources since the last run; the sources are still parsed whole")
+    parser.add_argument("--pack", metavar="BIN",
+                        help="append to this packed diehard input instead of the text file")
+    parser.add_argument("--mode", choices=modes, default="txt2bin", help="packing mode, see json2txt.py")
+    parser.add_argument("--bits", type=int, help="bits per number for the raw and reject modes")
+    parser.add_argument("--order", choices=mixes.keys(), default="D32",
+                        help="which group of datasets to convert")
+    parser.add_argument("--match", default="*",
+                        help="only convert datasets of the group whose path matches this pattern")
+    parser.add_argument("--counts", default=counts_dir,
+                        help="directory of the pair counts updated with the new draws, see cooccurrence.py")
+    parser.add_argument("--no-counts", dest="counts", action="store_const", const=None,
+                        help="don't update the pair counts")
+    args = parser.parse_args()
+    if args.bits and not (args.pack and args.mode in bit_modes):
+        parser.error(f"--bits only applies when packing with --mode {' or '.join(bit_modes)}")
+
+    datasets = [
+        d for d in registry if d["order"] == args.order and fnmatch(d["path"], args.match)
+    ]
+    if args.pack:
+        added = ingest(datasets, args.pack, args.mode, args.bits, args.counts)
+    else:
+        added = ingest(datasets, f"data/countries/{mixes[args.order]}.txt", None, None, args.counts)
+
+    for name, draws in added.items():
+        print(f"{name}: {draws} new draws")
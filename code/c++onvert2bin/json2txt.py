@@ -1,668 +1,456 @@
+import argparse
+import hashlib
+import json
+import os
+import numpy as np
 import pandas as pd
-from functools import reduce
-
-def read_lotto():
-    json = pd.read_json("data/LottoNumberArchive/Lottonumbers_complete.json")
-    data = json["data"]
-    numbers = [data[day]["Lottozahl"] for day in range(len(data))]
-    return reduce(lambda a, b: a + b, numbers)
-
-def read_eurojackpot():
-    lottery_draw = [
-        "Number 1", "Number 2", "Number 3", "Number 4", "Number 5", "Eurozahl 1", "Eurozahl 2"
-    ]
-    winnings = [    # Lottery prize in the draw and no. of winners and their winnings for each of 12 categories
-        f"{i+1}" for i in range(12 * 2)
-    ]
-
-    csv = pd.read_csv(
-        "data/Eurojackpot.csv",
-        sep=';',
-        header=0,
-        names=["Date"] + lottery_draw + ["Prize"] + winnings,
-        usecols=lottery_draw
-    )
-    
-    return csv.to_numpy().flatten()
-
-def read_sportka():
-    time_info = [
-        "Date", "Year", "Week", "Day"
-    ]
-    draw = [
-        f"d{d+1}n{n+1}" for n in range(7) for d in range(2)
-    ]
-
-    csv = pd.read_csv(
-        "data/Czech_Republic_Sportka.csv",
-        sep=';',
-        header=0,
-        names=time_info + draw,
-        usecols=draw
-    )
-    
-    return csv.to_numpy().flatten()
-
-def read_ny_lotto():
-    columns = ["Date", "Draw", "Bonus", "Extra"]
-
-    csv = pd.read_csv(
-        "data/NY_Lotto.csv",
-        sep=',',
-        header=0,
-        names=columns,
-        usecols=["Draw"]
-    )
-
-    numbers = [
-        [int(n) for n in row.split()] for row in csv["Draw"]
-    ]
-
-    return reduce(lambda a, b: a + b, numbers)
-
-def read_uk_lotto():
-    time_info = ["No.", "Day", "DD", "MMM", "YYYY"]
-    draw = ["Number 1", "Number 2", "Number 3", "Number 4", "Number 5", "Number 6", "Bonus Number"]
-    win_info = ["Jackpot", "Wins", "Machine", "Set"]
-
-    csv = pd.read_csv(
-        "data/UK_Lotto_drawn.csv",
-        sep=',',
-        header=0,
-        names=time_info + draw + win_info,
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_uk_lotto_tuesday():
-    time_info = ["No.", "Day", "DD", "MMM", "YYYY"]
-    draw = ["Number 1", "Number 2", "Number 3", "Number 4", "Number 5", "Number 6"]
-    win_info = ["Jackpot", "Wins", "Machine", "Set"]
-
-    csv = pd.read_csv(
-        "data/UK_Lotto_tuesdays_drawn.csv",
-        sep=',',
-        header=0,
-        names=time_info + draw + win_info,
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_texas_lotto():
-    time_info = ["Game Name", "Month", "Day", "Year"]
-    draw = ["Number 1", "Number 2", "Number 3", "Number 4", "Number 5", "Number 6"]
-
-    csv = pd.read_csv(
-        "data/Texas_Lotto.csv",
-        sep=',',
-        header=0,
-        names=time_info + draw,
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_italy_lotto():
-    info = ["Date", "City"]
-    draw = ["Number 1", "Number 2", "Number 3", "Number 4", "Number 5"]
-
-    csv = pd.read_csv(
-        "data/Italy_Lotto.csv",
-        sep=';',
-        header=0,
-        names=info + draw,
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_italy_lotto_super():
-    info = ["Date", "No. in year"]
-    draw = ["Number 1", "Number 2", "Number 3", "Number 4", "Number 5", "Number 6", "Jolly number"]
-
-    csv = pd.read_csv(
-        "data/Italy_Lotto_Super.csv",
-        sep=';',
-        header=0,
-        names=info + draw + ["Superstar number"],
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_italy_lotto_10e():
-    info = ["Date", "No. in year"]
-    draw = [f"Number {n+1}" for n in range(20)]
-    bonus = ["Bonus 1", "Bonus 2"]
-
-    csv = pd.read_csv(
-        "data/Italy_Lotto_10e.csv",
-        sep=';',
-        header=0,
-        names=info + draw + bonus,
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_israel_lotto():
-    info = ["Game", "Date"]
-    draw = [f"Number {n+1}" for n in range(6)]
-
-    csv = pd.read_csv(
-        "data/Israel_Lotto.csv",
-        sep=',',
-        header=0,
-        names=info + draw,
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_australia_monday_lotto():
-    info = ["Draw number", "Date"]
-    draw = [f"Number {n+1}" for n in range(8)]
-    winnings = [f"W{n}" for n in range(24)]
-
-    csv = pd.read_csv(
-        "data/Australia_Lotto_mondays.csv",
-        sep=',',
-        header=0,
-        names=info + draw + winnings,
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_australia_wednesday_lotto():
-    info = ["Draw number", "Date"]
-    draw = [f"Number {n+1}" for n in range(8)]
-    winnings = [f"W{n}" for n in range(24)]
-
-    csv = pd.read_csv(
-        "data/Australia_Lotto_wednesdays.csv",
-        sep=',',
-        header=0,
-        names=info + draw + winnings,
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_australia_saturdays_lotto():
-    info = ["Draw number", "Date"]
-    draw = [f"Number {n+1}" for n in range(8)]
-    winnings = [f"W{n}" for n in range(24)]
-
-    csv = pd.read_csv(
-        "data/Australia_Lotto_saturdays.csv",
-        sep=',',
-        header=0,
-        names=info + draw + winnings,
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_australia_oz_lotto():
-    info = ["Draw number", "Date"]
-    draw = [f"Number {n+1}" for n in range(6)]
-    bonus = ["Bonus 1", "Bonus 2"]
-    winnings = [f"W{n}" for n in range(28)]
-
-    csv = pd.read_csv(
-        "data/Australia_Lotto_oz.csv",
-        sep=',',
-        header=0,
-        names=info + draw + ["Number 7"] + bonus + ["Bonus 3"] + winnings,
-        usecols=draw + bonus    # Number 7 and Bonus got added later, not for all draws
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_australia_powerball():
-    info = ["Draw number", "Date"]
-    draw = [f"Number {n+1}" for n in range(5)]
-    ignore = ["Number 6", "Number 7", "Powerball"]
-    winnings = [f"W{n}" for n in range(36)]
-
-    csv = pd.read_csv(
-        "data/Australia_Powerball.csv",
-        sep=',',
-        header=0,
-        names=info + draw + ignore + winnings,
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_australia_set4life():
-    info = ["Draw number", "Date"]
-    draw = [f"Number {n+1}" for n in range(7)]
-    bonus = ["Bonus 1", "Bonus 2"]
-    winnings = [f"W{n}" for n in range(32)]
-
-    csv = pd.read_csv(
-        "data/Australia_Set4Life.csv",
-        sep=',',
-        header=0,
-        names=info + draw + ["Number 8"] + bonus + winnings,
-        usecols=draw + bonus
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_canada_lotto():
-    draw = [f"Number {n+1}" for n in range(7)]
-
-    csv = pd.read_csv(
-        "data/Canada_Lotto_649.csv",
-        sep=',',
-        header=0,
-        names=["Date"] + draw + ["Stupid trailing comma"],
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_ny_cash4life():
-    columns = ["Date", "Draw", "Cash Ball"]
-
-    csv = pd.read_csv(
-        "data/NY_Cash4Life.csv",
-        sep=',',
-        header=0,
-        names=columns,
-        usecols=["Draw"]
-    )
-
-    numbers = [
-        [int(n) for n in row.split()] for row in csv["Draw"]
-    ]
-
-    return reduce(lambda a, b: a + b, numbers)
-
-def read_ny_mega_millions():
-    columns = ["Date", "Draw", "Mega Ball", "Multiplier"]
-
-    csv = pd.read_csv(
-        "data/NY_Mega_Millions.csv",
-        sep=',',
-        header=0,
-        names=columns,
-        usecols=["Draw"]
-    )
-
-    numbers = [
-        [int(n) for n in row.split()] for row in csv["Draw"]
-    ]
-
-    return reduce(lambda a, b: a + b, numbers)
-
-def read_ny_pick_10():
-    columns = ["Date", "Draw"]
-
-    csv = pd.read_csv(
-        "data/NY_Pick_10.csv",
-        sep=',',
-        header=0,
-        names=columns,
-        usecols=["Draw"]
-    )
-
-    numbers = [
-        [int(n) for n in row.split()] for row in csv["Draw"]
-    ]
-
-    return reduce(lambda a, b: a + b, numbers)
-
-def read_ny_powerball():
-    columns = ["Date", "Draw", "Multiplier"]
-
-    csv = pd.read_csv(
-        "data/NY_Powerball.csv",
-        sep=',',
-        header=0,
-        names=columns,
-        usecols=["Draw"]
-    )
-
-    numbers = [
-        [int(n) for n in row.split()] for row in csv["Draw"]
-    ]
-
-    return reduce(lambda a, b: a + b, numbers)
-
-class read_ny_quick_draw:
-    def __init__(self, year):
-        self.year = year
-    
-    def __call__(self):
-        columns = ["Date", "Draw No.", "Draw Time", "Draw", "Extra"]
-
-        csv = pd.read_csv(
-            f"data/NY_Quick_Draw_{self.year}.csv",
-            sep=',',
-            header=0,
-            names=columns,
-            usecols=["Draw"]
-        )
-
-        numbers = [
-            [int(n) for n in row.split()] for row in csv["Draw"]
-        ]
-
-        return reduce(lambda a, b: a + b, numbers)
-
-def read_ny_take_5():
-    columns = ["Date", "Evening Draw", "Evening Bonus", "Midday Draw", "Midday Bonus"]
-
-    csv = pd.read_csv(
-        "data/NY_Take_5.csv",
-        sep=',',
-        header=0,
-        names=columns,
-        usecols=["Evening Draw", "Midday Draw"]
-    )
-
-    numbers = [
-        [int(n) for n in row.split()] for row in csv["Evening Draw"]
-    ]
-
-    return reduce(lambda a, b: a + b, numbers)
-
-def read_poland_lotto():
-    info = ["Index", "Date"]
-    draw = [f"Number {n+1}" for n in range(6)]
-
-    csv = pd.read_csv(
-        "data/Poland_Lotto.csv",
-        sep=',',
-        header=None,
-        names=info + draw,
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_poland_lotto_plus():
-    info = ["Index", "Date"]
-    draw = [f"Number {n+1}" for n in range(6)]
-
-    csv = pd.read_csv(
-        "data/Poland_Lotto_Plus.csv",
-        sep=',',
-        header=None,
-        names=info + draw,
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_poland_lotto_mini():
-    info = ["Index", "Date"]
-    draw = [f"Number {n+1}" for n in range(5)]
-
-    csv = pd.read_csv(
-        "data/Poland_Lotto_Mini.csv",
-        sep=',',
-        header=None,
-        names=info + draw,
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_poland_multi():
-    info = ["Index", "Date", "Time"]
-    draw = [f"Number {n+1}" for n in range(20)]
-
-    csv = pd.read_csv(
-        "data/Poland_Multi.csv",
-        sep=',',
-        header=None,
-        names=info + draw + ["Bonus"],
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_euromillions():
-    draw = [f"Number {n+1}" for n in range(5)]
-    bonus = ["Star 1", "Star 2"]
-
-    csv = pd.read_csv(
-        "data/Euromillions.csv",
-        sep=',',
-        header=0,
-        names=["Date"] + draw + bonus,
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_belgium_lotto():
-    draw = [f"Number {n+1}" for n in range(6)]
-
-    csv = pd.read_csv(
-        "data/Belgium_Lotto.csv",
-        sep=',',
-        header=0,
-        names=["Date"] + draw + ["Bonus"],
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_belgium_keno():
-    draw = [f"Number {n+1}" for n in range(20)]
-
-    csv = pd.read_csv(
-        "data/Belgium_Keno.csv",
-        sep=',',
-        header=0,
-        names=["Date"] + draw,
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_slovakia_keno10():
-    info = ["Index", "Date", "Week"]
-    draw = [f"Number {n+1}" for n in range(20)]
-
-    csv = pd.read_csv(
-        "data/Slovakia_Keno10.csv",
-        sep=';',
-        header=0,
-        names=info + draw,
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_slovakia_keno_10():
-    info = ["Index", "Date", "Week"]
-    draw = [f"Number {n+1}" for n in range(20)]
-
-    csv = pd.read_csv(
-        "data/Slovakia_Keno_10.csv",
-        sep=';',
-        header=0,
-        names=info + draw,
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_slovakia_lotto1():
-    info = ["Index", "Date", "Week"]
-    draw = [f"Number {n+1}" for n in range(6)] + ["Bonus"]
-    winnings = [f"Win Info {n+1}" for n in range(20)]
-
-    csv = pd.read_csv(
-        "data/Slovakia_Lotto1.csv",
-        sep=';',
-        header=0,
-        names=info + draw + winnings,
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_slovakia_lotto2():
-    info = ["Index", "Date", "Week"]
-    draw = [f"Number {n+1}" for n in range(6)] + ["Bonus"]
-    winnings = [f"Win Info {n+1}" for n in range(19)]
-
-    csv = pd.read_csv(
-        "data/Slovakia_Lotto2.csv",
-        sep=';',
-        header=0,
-        names=info + draw + winnings,
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_slovakia_lotto_535():
-    info = ["Index", "Date", "Week"]
-    draw = [f"Number {n+1}" for n in range(5)]
-    winnings = [f"Win Info {n+1}" for n in range(12)]
-
-    csv = pd.read_csv(
-        "data/Slovakia_Lotto_535.csv",
-        sep=';',
-        header=0,
-        names=info + draw + winnings,
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_nh_keno_603():
-    info = ["Name", "Date", "Time", "Draw No."]
-    draw = ["Draw"]
-
-    csv = pd.read_csv(
-        "data/NH_Keno_603.csv",
-        sep=',',
-        header=0,
-        names=info + draw + ["Bonus"] + ["Stupid trailing comma"],
-        usecols=draw
-    )
-
-    numbers = [
-        [int(n) for n in row.split("-")] for row in csv["Draw"]
-    ]
-
-    return reduce(lambda a, b: a + b, numbers)
-
-def read_slovakia_sportka1():
-    info = ["Index", "Date", "Week"]
-    draw = [f"Number {n+1}" for n in range(6)]
-    winnings = [f"Win Info {n+1}" for n in range(20)]
-
-    csv = pd.read_csv(
-        "data/Slovakia_Sportka1.csv",
-        sep=';',
-        header=0,
-        names=info + draw + ["Bonus"] + winnings,
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-def read_slovakia_sportka2():
-    info = ["Index", "Date", "Week"]
-    draw = [f"Number {n+1}" for n in range(6)]
-    winnings = [f"Win Info {n+1}" for n in range(19)]
-
-    csv = pd.read_csv(
-        "data/Slovakia_Sportka2.csv",
-        sep=';',
-        header=0,
-        names=info + draw + ["Bonus"] + winnings,
-        usecols=draw
-    )
-
-    return csv.to_numpy().flatten()
-
-class read_dc_keno:
-    def __init__(self, year):
-        self.year = year
-    
-    def __call__(self):
-        info = ["Date", "Draw No."]
-
-        csv = pd.read_csv(
-            f"data/DC_Keno_{self.year}.csv",
-            sep=',',
-            header=0,
-            names=info + ["Draw"],
-            usecols=["Draw"]
-        )
-
-        numbers = [
-            [int(n) for n in row.split()] for row in csv["Draw"]
-        ]
-
-        return reduce(lambda a, b: a + b, numbers)
-
-readers = [
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from fnmatch import fnmatch
+from itertools import chain
+from functools import partial
+from packing import modes, bit_modes, stream_writer
+from cache import cached, lookup
+from validation import validate, validator
+
+try:
+    from orjson import loads
+except ImportError:     # orjson is optional, json parses the same, only slower
+    from json import loads
+
+# Every dataset is described by one entry of the registry below:
+#   name    name of the source file without extension, identifies the dataset
+#   path    source file, relative to the repository root
+#   sep     column separator of the csv
+#   header  row number of the csv header, None if the file has no header
+#   draw    positions of the columns holding the drawn numbers
+#   split   delimiter if all numbers of a draw are stored in a single column
+#   trailing  values at the end of a split column that aren't drawn numbers, e.g.
+#           the multiplier of DC Keno, left out of the draws
+#   order   D32/D64 for numbers in drawn order, A32/A64 for ascending order,
+#           32 if the highest number is smaller than 64, 64 otherwise
+#   range   lowest and highest number of the game
+#   picks   numbers drawn per draw, by default one per draw column, see validation.py
+#   bonus   ranges of the numbers drawn after the main draw, one per number: bonus and
+#           supplementary numbers, or ones from a drum of their own like the two
+#           Eurozahlen 1-12 of Eurojackpot. The first main = picks - len(bonus)
+#           numbers are the main draw, distinct numbers out of range, the one the
+#           uniformity tests are about.
+#   date    positions of the columns holding the date of a draw, joined by spaces
+#           and parsed by pd.to_datetime with date_format
+def dataset(path, draw, order, range, sep=',', header=0, split=None, date=(), date_format=None, picks=None, trailing=0, bonus=()):
+    picks = len(draw) if picks is None else picks
+    return {
+        "name": os.path.splitext(os.path.basename(path))[0],
+        "path": path,
+        "sep": sep,
+        "header": header,
+        "draw": list(draw),
+        "split": split,
+        "trailing": trailing,
+        "order": order,
+        "range": range,
+        "picks": picks,
+        "main": picks - len(bonus),
+        "bonus": [list(r) for r in bonus],
+        "date": list(date),
+        "date_format": date_format
+    }
+
+# Names of the outputs combining all datasets of one order class
+mixes = {
+    "D32": "Drawn32",
+    "D64": "Drawn64",
+    "A32": "Ascending32",
+    "A64": "Ascending64"
+}
+
+def dc_keno(year):
+    return dataset(f"data/DC_Keno_{year}.csv", [2], "D64", (1, 80), split=' ', date=[0], date_format="%B %d, %Y", picks=20, trailing=1)
+
+def ny_quick_draw(year):
+    return dataset(f"data/NY_Quick_Draw_{year}.csv", [3], "A64", (1, 80), split=' ', date=[0], date_format="%m/%d/%Y", picks=20)
+
+registry = [
     # Datasets in drawn order with max number smaller than 64
-    read_uk_lotto,                  # D32
-    read_uk_lotto_tuesday,          # D32
-    read_eurojackpot,               # D32
-    read_sportka,                   # D32
-    read_slovakia_sportka2,         # D32
-    read_slovakia_lotto1,           # D32
-    read_slovakia_lotto2,           # D32
-    read_slovakia_lotto_535,        # D32
-    read_australia_monday_lotto,    # D32
-    read_australia_wednesday_lotto, # D32
-    read_australia_powerball,       # D32
-    read_australia_set4life,        # D32
-    read_australia_saturdays_lotto, # D32*
-    
+    dataset("data/UK_Lotto_drawn.csv", range(5, 12), "D32", (1, 59), date=[2, 3, 4], date_format="%d %b %Y", bonus=[(1, 59)]),
+    dataset("data/UK_Lotto_tuesdays_drawn.csv", range(5, 11), "D32", (1, 49), date=[2, 3, 4], date_format="%d %b %Y"),
+    dataset("data/Eurojackpot.csv", range(1, 8), "D32", (1, 50), sep=';', date=[0], date_format="%d.%m.%Y", bonus=[(1, 12)] * 2),
+    dataset("data/Czech_Republic_Sportka.csv", range(4, 18), "D32", (1, 49), sep=';', date=[0], date_format="%d. %m. %Y",
+            bonus=[(1, 49)] * 8),     # additional number of the 1st draw, then the 2nd draw
+    dataset("data/Slovakia_Sportka2.csv", range(3, 9), "D32", (1, 49), sep=';', date=[1], date_format="%d.%m.%Y"),
+    dataset("data/Slovakia_Lotto1.csv", range(3, 10), "D32", (1, 49), sep=';', date=[1], date_format="%d.%m.%Y", bonus=[(1, 49)]),
+    dataset("data/Slovakia_Lotto2.csv", range(3, 10), "D32", (1, 49), sep=';', date=[1], date_format="%d.%m.%Y", bonus=[(1, 49)]),
+    dataset("data/Slovakia_Lotto_535.csv", range(3, 8), "D32", (1, 35), sep=';', date=[1], date_format="%d.%m.%Y"),
+    dataset("data/Australia_Lotto_mondays.csv", range(2, 10), "D32", (1, 45), date=[1], date_format="%d/%m/%Y", bonus=[(1, 45)] * 2),
+    dataset("data/Australia_Lotto_wednesdays.csv", range(2, 10), "D32", (1, 45), date=[1], date_format="%d/%m/%Y", bonus=[(1, 45)] * 2),
+    dataset("data/Australia_Powerball.csv", range(2, 7), "D32", (1, 45), date=[1], date_format="%d/%m/%Y"),
+    dataset("data/Australia_Set4Life.csv", [2, 3, 4, 5, 6, 7, 8, 10, 11], "D32", (1, 44), date=[1], date_format="%d/%m/%Y", bonus=[(1, 44)] * 2),
+    dataset("data/Australia_Lotto_saturdays.csv", range(2, 10), "D32", (1, 45), date=[1], date_format="%d/%m/%Y", bonus=[(1, 45)] * 2),    # *
+
     # Datasets in drawn order with max number greater or equal to 64
-    # read_italy_lotto,               # D64
-    
+    dataset("data/Italy_Lotto.csv", range(2, 7), "D64", (1, 90), sep=';', date=[0], date_format="%d/%m/%Y"),
+
     # Datasets in ascending order with max number smaller than 64
-    # read_slovakia_sportka1,         # A32*
-    # read_lotto,                     # A32
-    # read_ny_lotto,                  # A32    
-    # read_texas_lotto,               # A32
-    # read_israel_lotto,              # A32    
-    # read_australia_oz_lotto,        # A32    
-    # read_canada_lotto,              # A32
-    # read_ny_cash4life,              # A32
-    # read_ny_take_5,                 # A32
-    # read_poland_lotto,              # A32
-    # read_poland_lotto_plus,         # A32
-    # read_poland_lotto_mini,         # A32    
-    # read_euromillions,              # A32
-    # read_belgium_lotto,             # A32
+    dataset("data/Slovakia_Sportka1.csv", range(3, 9), "A32", (1, 49), sep=';', date=[1], date_format="%d.%m.%Y"),  # *
+    dataset("data/LottoNumberArchive/Lottonumbers_complete.json", [], "A32", (1, 49), date_format="%d.%m.%Y", picks=6),
+    dataset("data/NY_Lotto.csv", [1], "A32", (1, 59), split=' ', date=[0], date_format="%m/%d/%Y", picks=6),
+    dataset("data/Texas_Lotto.csv", range(4, 10), "A32", (1, 54), date=[1, 2, 3], date_format="%m %d %Y"),
+    dataset("data/Israel_Lotto.csv", range(2, 8), "A32", (1, 49), date=[1], date_format="%d/%m/%Y"),
+    dataset("data/Australia_Lotto_oz.csv", [2, 3, 4, 5, 6, 7, 9, 10], "A32", (1, 47), date=[1], date_format="%d/%m/%Y", bonus=[(1, 47)] * 2),  # Number 7 and Bonus got added later, not for all draws
+    dataset("data/Canada_Lotto_649.csv", range(1, 8), "A32", (1, 49), date=[0], date_format="mixed", bonus=[(1, 49)]),   # both 2 and 4 digit years
+    dataset("data/NY_Cash4Life.csv", [1], "A32", (1, 60), split=' ', date=[0], date_format="%m/%d/%Y", picks=5),
+    dataset("data/NY_Take_5.csv", [1], "A32", (1, 39), split=' ', date=[0], date_format="%m/%d/%Y", picks=5),
+    dataset("data/Poland_Lotto.csv", range(2, 8), "A32", (1, 49), header=None, date=[1], date_format="%d.%m.%Y"),
+    dataset("data/Poland_Lotto_Plus.csv", range(2, 8), "A32", (1, 49), header=None, date=[1], date_format="%d.%m.%Y"),
+    dataset("data/Poland_Lotto_Mini.csv", range(2, 7), "A32", (1, 49), header=None, date=[1], date_format="%d.%m.%Y"),
+    dataset("data/Euromillions.csv", range(1, 6), "A32", (1, 50), date=[0], date_format="%Y-%m-%d"),
+    dataset("data/Belgium_Lotto.csv", range(1, 7), "A32", (1, 45), date=[0], date_format="%Y-%m-%d"),
 
     # Datasets in ascending order with max number greater or equal to 64
-    # read_belgium_keno,              # A64
-    # read_slovakia_keno_10,          # A64    
-    # read_nh_keno_603,               # A64    
-    # read_poland_multi,              # A64
-    # read_italy_lotto_super,         # A64
-    # read_italy_lotto_10e,           # A64
-    # read_ny_mega_millions,          # A64
-    # read_ny_pick_10,                # A64
-    # read_ny_powerball,              # A64
-    
+    dataset("data/Belgium_Keno.csv", range(1, 21), "A64", (1, 80), date=[0], date_format="%Y-%m-%d"),
+    dataset("data/Slovakia_Keno_10.csv", range(3, 23), "A64", (1, 80), sep=';', date=[1], date_format="%d.%m.%Y"),
+    dataset("data/NH_Keno_603.csv", [4], "A64", (1, 80), split='-', date=[1], date_format="%m/%d/%Y", picks=20),
+    dataset("data/Poland_Multi.csv", range(3, 23), "A64", (1, 80), header=None, date=[1], date_format="%d.%m.%Y"),
+    dataset("data/Italy_Lotto_Super.csv", range(2, 9), "A64", (1, 90), sep=';', date=[0], date_format="%d/%m/%Y", bonus=[(1, 90)]),
+    dataset("data/Italy_Lotto_10e.csv", range(2, 22), "A64", (1, 90), sep=';', date=[0], date_format="%d/%m/%Y"),
+    dataset("data/NY_Mega_Millions.csv", [1], "A64", (1, 75), split=' ', date=[0], date_format="%m/%d/%Y", picks=5),
+    dataset("data/NY_Pick_10.csv", [1], "A64", (1, 80), split=' ', date=[0], date_format="%m/%d/%Y", picks=20),
+    dataset("data/NY_Powerball.csv", [1], "A64", (1, 69), split=' ', date=[0], date_format="%m/%d/%Y", picks=6, bonus=[(1, 39)]),
+
     # Separate datasets because they are huge, loaded per individual years
-    # read_dc_keno(2021),           # D64
-    # read_ny_quick_draw(2023),     # A64
+    dc_keno(2020),
+    dc_keno(2023),
+    ny_quick_draw(2023),
 ]
 
-with open("data/countries/Drawn32.txt", "w") as out:
-    for read in readers:
-        for number in read():
-            print(number, file=out)
+def per_year(dataset):
+    return dataset["name"].startswith(("DC_Keno_", "NY_Quick_Draw_"))
+
+# Datasets of the registry with these years of DC Keno and NY Quick Draw instead of the
+# ones in it, only those whose path matches the pattern
+def select(datasets=registry, dc_keno_years=None, quick_draw_years=None, match="*"):
+    chosen = [d for d in datasets if not per_year(d)]
+    chosen += [dc_keno(year) for year in dc_keno_years] if dc_keno_years else \
+              [d for d in datasets if d["name"].startswith("DC_Keno_")]
+    chosen += [ny_quick_draw(year) for year in quick_draw_years] if quick_draw_years else \
+              [d for d in datasets if d["name"].startswith("NY_Quick_Draw_")]
+    return [d for d in chosen if fnmatch(d["path"], match)]
+
+# The datasets whose file exists, the others are reported and left out
+def existing(datasets):
+    for d in datasets:
+        if not os.path.exists(d["path"]):
+            print(f"Skipping {d['name']}, {d['path']} doesn't exist")
+    return [d for d in datasets if os.path.exists(d["path"])]
+
+# The German archive is one JSON object, {"data": [{"date": ..., "Lottozahl": [...], ...}, ...]},
+# of which only the dates and numbers are used. It is parsed with orjson if installed,
+# and the numbers are copied into arrays allocated once instead of building a DataFrame.
+def read_lotto_json(dataset):
+    with open(dataset["path"], "rb") as f:
+        return loads(f.read())["data"]
+
+def lotto_numbers(data):
+    picks = np.fromiter((len(day["Lottozahl"]) for day in data), dtype=np.intp, count=len(data))
+    numbers = np.fromiter(chain.from_iterable(day["Lottozahl"] for day in data), dtype=np.uint8, count=picks.sum())
+    return numbers, picks
+
+def read_lotto(dataset):
+    draws, picks, _ = read_lotto_table(dataset)
+    keep = validate(draws, picks, dataset)
+    return flatten(draws[keep], picks[keep])
+
+def read_lotto_table(dataset):
+    data = read_lotto_json(dataset)
+    numbers, picks = lotto_numbers(data)
+    draws = np.zeros((len(data), picks.max(initial=0)), dtype=np.uint8)
+    draws[np.arange(draws.shape[1]) < picks[:, None]] = numbers
+    dates = pd.to_datetime([day["date"] for day in data], format=dataset["date_format"], errors="coerce")
+    return draws, picks, dates
+
+# Turns a column of delimited draws, e.g. "03 07 11 ..." or "01-08-10-...", into a
+# 2-D uint8 matrix with one row per draw. Any non-digit character ends a number, so
+# the delimiter itself doesn't matter. Numbers beyond uint8 become 255, out of the
+# range of every game. Rows with fewer picks than the widest one are padded with
+# zeros, the number of picks in every row is returned alongside.
+#
+# The column is tokenized in blocks of block_rows draws, so the offsets kept per
+# number only take memory for one block and not for the whole column.
+block_rows = 1 << 16
+
+def split_draws(column):
+    if len(column) <= block_rows:
+        return tokenize(column)
+
+    blocks = [tokenize(column.iloc[start:start + block_rows]) for start in range(0, len(column), block_rows)]
+    picks = np.concatenate([picks for _, picks in blocks])
+    width = picks.max(initial=0)
+    if all(draws.shape[1] == width for draws, _ in blocks):
+        return np.concatenate([draws for draws, _ in blocks]), picks
+
+    draws = np.zeros((len(column), width), dtype=np.uint8)
+    start = 0
+    for block, block_picks in blocks:
+        draws[start:start + len(block_picks), :block.shape[1]] = block
+        start += len(block_picks)
+    return draws, picks
+
+# split_draws() of one block, in a single pass over its joined text
+def tokenize(column):
+    text = "\n".join(column.fillna("")).encode()
+    chars = np.frombuffer(text, dtype=np.uint8)
+
+    digit = ((chars >= ord('0')) & (chars <= ord('9'))).view(np.int8)
+    edges = np.diff(digit, prepend=np.int8(0), append=np.int8(0))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    del digit, edges
+
+    # Accumulate the numbers digit by digit from their ends, in int32 so that longer
+    # tokens don't wrap around into valid numbers, anything above 9 digits is too large
+    lengths = ends - starts
+    values = np.zeros(len(starts), dtype=np.int32)
+    for k in range(1, min(lengths.max(initial=0), 9) + 1):
+        inside = np.flatnonzero(lengths >= k)
+        values[inside] += (chars[ends[inside] - k] - ord('0')).astype(np.int32) * 10 ** (k - 1)
+    values[lengths > 9] = 255
+    values = np.minimum(values, 255).astype(np.uint8)
+
+    rows = np.searchsorted(np.flatnonzero(chars == ord('\n')), starts)
+    picks = np.bincount(rows, minlength=len(column))
+    if len(column) and picks.min() == picks.max():
+        return values.reshape(len(column), -1), picks
+
+    columns = np.arange(len(starts)) - np.repeat(np.cumsum(picks) - picks, picks)
+    draws = np.zeros((len(column), picks.max(initial=0)), dtype=np.uint8)
+    draws[rows, columns] = values
+    return draws, picks
+
+# Row-major concatenation of all draws, skipping the padding of shorter rows
+def flatten(draws, picks):
+    if picks.min(initial=0) == draws.shape[1]:
+        return draws.ravel()
+    return draws[np.arange(draws.shape[1]) < picks[:, None]]
+
+def read_csv(dataset, dates=False, **kwargs):
+    dtype = {column: str if dataset["split"] else "float32" for column in dataset["draw"]}     # float keeps empty cells
+    if dates:
+        dtype.update({column: str for column in dataset["date"]})
+
+    return pd.read_csv(
+        dataset["path"],
+        sep=dataset["sep"],
+        header=None,    # header rows don't always match the rows below, so read positions only
+        skiprows=0 if dataset["header"] is None else dataset["header"] + 1,
+        usecols=list(dtype),
+        dtype=dtype,
+        engine="c",
+        **kwargs
+    )
+
+# Empty cells count as numbers missing from the draw and are 0 in the matrix, numbers
+# beyond uint8 become 255 like in split_draws(), both are out of the range of every game
+def to_draws(csv, dataset):
+    if dataset["split"] is None:
+        values = csv[dataset["draw"]].to_numpy()
+        missing = np.isnan(values)
+        draws = np.where(missing, 0, values).clip(0, 255).astype(np.uint8)
+        return draws, values.shape[1] - missing.sum(axis=1)
+
+    draws, picks = split_draws(csv[dataset["draw"][0]])
+    if dataset["trailing"]:
+        picks = np.maximum(picks - dataset["trailing"], 0)
+        draws = np.where(np.arange(draws.shape[1]) < picks[:, None], draws, 0)[:, :picks.max(initial=0)]
+    return draws, picks
+
+def to_numbers(csv, dataset):
+    draws, picks = to_draws(csv, dataset)
+    keep = validate(draws, picks, dataset)
+    return flatten(draws[keep], picks[keep])
+
+def to_dates(csv, dataset):
+    parts = csv[dataset["date"]].apply(lambda column: column.str.strip())
+    text = parts.iloc[:, 0].str.cat(parts.iloc[:, 1:], sep=' ')
+    return pd.to_datetime(text, format=dataset["date_format"], errors="coerce").to_numpy()
+
+def read(dataset):
+    if dataset["path"].endswith(".json"):
+        return read_lotto(dataset)
+    return to_numbers(read_csv(dataset), dataset)
+
+# Draws of the dataset in file order as a 2-D matrix padded like in split_draws(),
+# with the number of picks and the date (NaT if missing) of every draw
+def read_table(dataset):
+    if dataset["path"].endswith(".json"):
+        return read_lotto_table(dataset)
+
+    csv = read_csv(dataset, dates=True)
+    return *to_draws(csv, dataset), to_dates(csv, dataset)
+
+# Mark of the rows of a table of read_table(), so the rows added to its source later
+# can be told apart from them: how many there are, a hash of them and the last date
+# among them. See new_rows().
+start_mark = {"rows": 0, "hash": None, "last_date": None}
+
+def rows_hash(draws, picks, dates):
+    digest = hashlib.sha256()
+    digest.update(np.asarray(picks, dtype=np.int64).tobytes())
+    digest.update(flatten(draws, picks).tobytes())
+    digest.update(np.asarray(dates, dtype="datetime64[ns]").view(np.int64).tobytes())
+    return digest.hexdigest()
+
+def row_mark(draws, picks, dates):
+    known = pd.DatetimeIndex(dates).dropna()
+    return {"rows": len(picks), "hash": rows_hash(draws, picks, dates),
+            "last_date": str(known.max().date()) if len(known) else None}
+
+# Indices of the rows of the table added since the mark was taken. New draws are at
+# the end of sources in date order and at the top of newest-first ones, so the rows
+# of the mark are looked for at the end of the table if its first row is dated after
+# the mark, else at its start, and then at the other end. They must hash the same as
+# when they were read, a source whose rows read before changed raises ValueError.
+def new_rows(dataset, draws, picks, dates, mark):
+    total, before = len(picks), mark["rows"]
+    if before == 0:
+        return np.arange(total)
+    if total < before:
+        raise ValueError(f"{dataset['path']} has {total} draws, fewer than the {before} read before")
+
+    top = np.arange(total - before), slice(total - before, total)
+    bottom = np.arange(before, total), slice(0, before)
+    first = pd.Timestamp(dates[0]) if total else pd.NaT
+    newest_first = mark["last_date"] is not None and first > pd.Timestamp(mark["last_date"])
+    for new, old in ([top, bottom] if newest_first else [bottom, top]):
+        if rows_hash(draws[old], picks[old], np.asarray(dates)[old]) == mark["hash"]:
+            return new
+    raise ValueError(f"{dataset['path']} changed in the {before} draws read before")
+
+# Same numbers as read(dataset), but parsed and returned per chunk of draws, so
+# memory doesn't grow with the size of the file. The counts of the checks are added
+# up over the chunks and compared with the baseline of the whole dataset.
+def read_chunks(dataset, chunksize):
+    if dataset["path"].endswith(".json"):
+        yield read_lotto(dataset)
+        return
+
+    checks = validator(dataset)
+    with read_csv(dataset, chunksize=chunksize) as chunks:
+        for csv in chunks:
+            draws, picks = to_draws(csv, dataset)
+            keep = checks.update(draws, picks)
+            yield flatten(draws[keep], picks[keep])
+    checks.report()
+
+# read() and read_chunks() going through the cache of parsed datasets in cache_dir
+def load(dataset, cache_dir=None):
+    if cache_dir is None:
+        return read(dataset)
+    return cached(dataset, read, cache_dir)
+
+def load_chunks(dataset, chunksize, cache_dir=None):
+    numbers = lookup(dataset, cache_dir) if cache_dir else None
+    if numbers is None:
+        yield from read_chunks(dataset, chunksize)
+        return
+
+    for start in range(0, len(numbers), chunksize):
+        yield numbers[start:start + chunksize]
+
+# Packs the numbers of every dataset into the output of its mix, {out_dir}/{mix}.bin,
+# so all four mixes are written in one pass over the datasets. {out_dir}/manifest.json
+# records the bytes of every output and for every source the bits it takes from its
+# first bit on, and the bytes from the one holding its first bit up to the last byte
+# written after it, which add up to the bytes of the output.
+def pack_mixes(datasets, numbers, out_dir, mode="txt2bin", bits=None):
+    os.makedirs(out_dir, exist_ok=True)
+    outputs = {order: open(os.path.join(out_dir, f"{mix}.bin"), "wb") for order, mix in mixes.items()}
+    writers = {order: stream_writer(out, mode, bits) for order, out in outputs.items()}
+    manifest = {mix: {"path": outputs[order].name, "mode": mode, "bits": bits, "sources": {}}
+                for order, mix in mixes.items()}
+
+    try:
+        for d, chunks in zip(datasets, numbers):
+            writer = writers[d["order"]]
+            start, count = writer.position(), 0
+            for chunk in chunks:
+                writer.write(chunk, d["range"])
+                count += len(chunk)
+            manifest[mixes[d["order"]]]["sources"][d["name"]] = {
+                "numbers": count,
+                "start_bit": start,
+                "bits": writer.position() - start,
+                "start_byte": start // 8,
+                "bytes": writer.written - start // 8
+            }
+    finally:
+        for out in outputs.values():
+            out.close()
+
+    for order, writer in writers.items():
+        manifest[mixes[order]]["bytes"] = writer.written
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=4)
+    return manifest
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pack", metavar="BIN",
+                        help="write the packed diehard input instead of the text file, "
+                             "with --all the directory of the packed inputs of all mixes")
+    parser.add_argument("--all", action="store_true",
+                        help="pack the datasets of all four mixes in one pass, see pack_mixes")
+    parser.add_argument("--mode", choices=modes, default="txt2bin",
+                        help="txt2bin packs 6 bits of every number up to 64 exactly as txt2bin does, "
+                             "the other modes pack each dataset by its own number range (see packing.encode)")
+    parser.add_argument("--bits", type=int, help="bits per number for the raw and reject modes")
+    parser.add_argument("--order", choices=mixes.keys(), default="D32",
+                        help="which group of datasets to convert")
+    parser.add_argument("--match", default="*",
+                        help="only convert datasets of the group whose path matches this pattern, "
+                             "e.g. 'data/NY_Quick_Draw_*'")
+    parser.add_argument("--chunksize", type=int,
+                        help="stream the datasets in chunks of this many draws to keep memory constant")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="read this many datasets in parallel, the output stays in registry order")
+    parser.add_argument("--cache", default="data/cache",
+                        help="directory caching the parsed datasets, see cache.py")
+    parser.add_argument("--no-cache", dest="cache", action="store_const", const=None,
+                        help="always parse the source files")
+    args = parser.parse_args()
+    if args.all and not args.pack:
+        parser.error("--all needs --pack, the directory to write the mixes to")
+    if args.jobs > 1 and args.chunksize:
+        parser.error("--jobs reads whole datasets, it can't be combined with --chunksize")
+    if args.bits and not (args.pack and args.mode in bit_modes):
+        parser.error(f"--bits only applies when packing with --mode {' or '.join(bit_modes)}")
+
+    datasets = [
+        d for d in registry if (args.all or d["order"] == args.order) and fnmatch(d["path"], args.match)
+    ]
+    datasets = existing(datasets)
+
+    # Chunks of numbers of every dataset, in registry order. Parallel reads are
+    # returned by the pool in submission order, so the output doesn't depend on --jobs.
+    with ProcessPoolExecutor(args.jobs) if args.jobs > 1 else nullcontext() as pool:
+        if pool:
+            numbers = ([chunk] for chunk in pool.map(partial(load, cache_dir=args.cache), datasets))
+        elif args.chunksize:
+            numbers = (load_chunks(d, args.chunksize, args.cache) for d in datasets)
+        else:
+            numbers = ([load(d, args.cache)] for d in datasets)
+
+        if args.all:
+            pack_mixes(datasets, numbers, args.pack, args.mode, args.bits)
+        elif args.pack:
+            with open(args.pack, "wb") as out:
+                writer = stream_writer(out, args.mode, args.bits)
+                for d, chunks in zip(datasets, numbers):
+                    for chunk in chunks:
+                        writer.write(chunk, d["range"])
+        else:
+            with open(f"data/countries/{mixes[args.order]}.txt", "w") as out:
+                for chunks in numbers:
+                    for chunk in chunks:
+                        for number in chunk:
+                            print(number, file=out)
@@ -0,0 +1,124 @@
+import numpy as np
+
+modes = ["txt2bin", "raw", "reject", "split"]
+bit_modes = ["raw", "reject"]   # modes taking the bits per number
+
+# Python counterpart of txt2bin.cpp, producing the same bytes without the text file
+# in between. Numbers above 64 are skipped, the others are shifted to 0-63 and
+# packed as 6-bit values, least significant bit first. Bits that don't complete a
+# byte at the end of the stream are dropped.
+def pack(numbers):
+    bits = txt2bin_bits(numbers)
+    return pack_bits(bits[:-2])
+
+# Bits written by txt2bin for the numbers, plus two bits reaching into the next number.
+# txt2bin stores number - 1 as uint8, so a 0 becomes 255 and its two upper bits are
+# or-ed into the bits of the following number.
+def txt2bin_bits(numbers):
+    numbers = np.asarray(numbers)
+    numbers = numbers[numbers <= 64]
+    values = (numbers.astype(np.int64) - 1).astype(np.uint8)
+
+    bits = np.zeros(6 * len(values) + 2, dtype=np.uint8)
+    bits[:6 * len(values)] = np.unpackbits(values[:, None], axis=1, count=6, bitorder="little").ravel()
+    overflow = np.flatnonzero(values >> 6)
+    bits[6 * overflow + 6] |= (values[overflow] >> 6) & 1
+    bits[6 * overflow + 7] |= values[overflow] >> 7
+    return bits
+
+# Bit width of a game with numbers in range = (low, high), rounded down to keep
+# the values uniform, or up to keep all of them
+def bit_width(range, round_up=False):
+    size = range[1] - range[0] + 1
+    return (size - 1).bit_length() if round_up else size.bit_length() - 1
+
+# Converts numbers drawn uniformly from range = (low, high) into a stream of bits,
+# least significant bit first. Numbers outside the range are skipped.
+#   raw     every number takes bit_width(range, round_up=True) or the given bits,
+#           which is not uniform unless the range size is a power of two
+#   reject  only numbers below the largest power of two fitting in the range are
+#           kept, each taking bit_width(range) or fewer given bits, more bits would
+#           keep values that aren't uniform and are an error
+#   split   the range is split into power of two blocks (e.g. 49 = 32 + 16 + 1),
+#           each number gives as many uniform bits as its block has, so no entropy
+#           is thrown away except for the last single-value block
+def encode(numbers, range, mode="reject", bits=None):
+    numbers = np.asarray(numbers)
+    numbers = numbers[(numbers >= range[0]) & (numbers <= range[1])]
+    values = (numbers - range[0]).astype(np.uint8)
+
+    if mode == "raw":
+        widths = np.full(len(values), bits or bit_width(range, round_up=True))
+    elif mode == "reject":
+        width = bits or bit_width(range)
+        if width > bit_width(range):
+            raise ValueError(f"{bits} bits are more than the {bit_width(range)} uniform bits of numbers "
+                             f"{range[0]}-{range[1]} in reject mode")
+        values = values[values < 2 ** width]
+        widths = np.full(len(values), width)
+    elif mode == "split":
+        widths = np.zeros(len(values), dtype=np.uint8)
+        remaining = np.ones(len(values), dtype=bool)
+        size = range[1] - range[0] + 1
+        while size > 1:
+            width = size.bit_length() - 1
+            block = remaining & (values < 2 ** width)
+            widths[block] = width
+            values[remaining & ~block] -= 2 ** width
+            remaining &= ~block
+            size -= 2 ** width
+    else:
+        raise ValueError(f"Unknown packing mode {mode}, use one of {modes[1:]}")
+
+    lsb_first = np.unpackbits(values[:, None], axis=1, bitorder="little")
+    return lsb_first[np.arange(8) < widths[:, None]]
+
+# Bits every number 0-255 takes in the stream of txt2bin_bits() or encode(), 0 for
+# the numbers that are skipped, so the length of a stream is known from the counts
+# of its numbers without packing them
+def number_bits(range=None, mode="txt2bin", bits=None):
+    if mode == "txt2bin":
+        return np.where(np.arange(256) <= 64, 6, 0)
+    table = np.zeros(256, dtype=np.int64)
+    for number in np.arange(range[0], range[1] + 1):
+        table[number] = len(encode([number], range, mode, bits))
+    return table
+
+# Bytes of a bit stream, dropping the bits that don't complete the last byte
+def pack_bits(bits):
+    return np.packbits(bits[:len(bits) // 8 * 8], bitorder="little")
+
+# Packs numbers chunk by chunk into an open binary file. The bits that don't complete
+# a byte are kept for the next chunk, so the file is the same as when packing all
+# numbers at once, while only one chunk is held in memory.
+class stream_writer:
+    def __init__(self, out, mode="txt2bin", bits=None):
+        if bits and mode not in bit_modes:
+            raise ValueError(f"Bits per number only apply to the modes {bit_modes}, not {mode}")
+        self.out = out
+        self.mode = mode
+        self.bits = bits
+        self.pending = np.zeros(0, dtype=np.uint8)  # bits not completing a byte yet
+        self.carry = np.zeros(0, dtype=np.uint8)    # txt2bin bits or-ed into the next number
+        self.written = 0
+
+    # Bits of the stream so far, written or pending
+    def position(self):
+        return 8 * self.written + len(self.pending)
+
+    def write(self, numbers, range=None):
+        if self.mode == "txt2bin":
+            bits = txt2bin_bits(numbers)
+            bits, carry = bits[:-2], bits[-2:]
+            if len(bits) == 0:
+                return
+            bits[:len(self.carry)] |= self.carry
+            self.carry = carry
+        else:
+            bits = encode(numbers, range, self.mode, self.bits)
+
+        bits = np.concatenate((self.pending, bits))
+        complete = len(bits) // 8 * 8
+        self.out.write(pack_bits(bits[:complete]).tobytes())
+        self.written += complete // 8
+        self.pending = bits[complete:]
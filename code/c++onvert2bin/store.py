@@ -0,0 +1,90 @@
+import argparse
+import numpy as np
+import pandas as pd
+from json2txt import registry, existing, read_table, flatten
+from validation import validate
+
+# Columnar store of all draws, one row per drawn number, written as a Parquet dataset
+# partitioned by country, game and year. Columns:
+#   game      name of the dataset in the registry
+#   country   see countries below
+#   year      year of the draw, -1 for draws whose date couldn't be parsed, partition only
+#   date      date of the draw
+#   draw      index of the draw in its source file
+#   position  position of the number within the draw
+#   number    the drawn number
+#   order     D for numbers in drawn order, A for ascending order
+#   width     32 or 64, see the order classes in json2txt
+# Any mix becomes a filter on these columns, e.g. Drawn32 without Australian Saturday Lotto:
+#   numbers(query(filters=[("order", "==", "D"), ("width", "==", 32),
+#                          ("game", "!=", "Australia_Lotto_saturdays")]))
+
+store_dir = "data/store"
+partitions = ["country", "game", "year"]
+
+countries = {
+    "UK": "United Kingdom",
+    "Czech": "Czech Republic",
+    "NY": "USA",
+    "NH": "USA",
+    "DC": "USA",
+    "Texas": "USA",
+    "Eurojackpot": "Europe",
+    "Euromillions": "Europe",
+    "Lottonumbers": "Germany"
+}
+
+def country(dataset):
+    prefix = dataset["name"].split("_")[0]
+    return countries.get(prefix, prefix)
+
+# The draws dropped by validation.validate() are left out like in json2txt.read(),
+# the draw column keeps the index of every draw in the source file
+def to_frame(dataset):
+    draws, picks, dates = read_table(dataset)
+    kept = np.flatnonzero(validate(draws, picks, dataset))
+    draws, picks, dates = draws[kept], picks[kept], np.asarray(dates)[kept]
+    rows, positions = np.nonzero(np.arange(draws.shape[1]) < picks[:, None])
+
+    return pd.DataFrame({
+        "game": dataset["name"],
+        "country": country(dataset),
+        "year": pd.DatetimeIndex(dates[rows]).year.fillna(-1).astype(np.int16),
+        "date": dates[rows],
+        "draw": kept[rows].astype(np.uint32),
+        "position": positions.astype(np.uint8),
+        "number": flatten(draws, picks),
+        "order": dataset["order"][0],
+        "width": np.uint8(int(dataset["order"][1:]))
+    })
+
+# Writes the datasets into the store, replacing the partitions they had before
+def ingest(datasets, path=store_dir):
+    for dataset in existing(datasets):
+        to_frame(dataset).to_parquet(
+            path,
+            partition_cols=partitions,
+            index=False,
+            existing_data_behavior="delete_matching"
+        )
+
+# Rows of the store matching the filters, in the order of the registry and source files.
+# Filters are pushed down to the Parquet reader, see pd.read_parquet.
+def query(filters=None, columns=None, path=store_dir):
+    frame = pd.read_parquet(path, filters=filters, columns=columns)
+    if {"game", "draw", "position"} <= set(frame.columns):
+        games = [d["name"] for d in registry]
+        frame["game"] = pd.Categorical(frame["game"], categories=games, ordered=True)
+        frame = frame.sort_values(["game", "draw", "position"], ignore_index=True)
+    return frame
+
+# The numbers of a queried mix as one array, the same as concatenating json2txt.read()
+def numbers(frame):
+    return frame["number"].to_numpy(dtype=np.uint8)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--store", default=store_dir, help="directory of the Parquet dataset")
+    args = parser.parse_args()
+
+    ingest(registry, args.store)
@@ -0,0 +1,81 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from math import comb
+from scipy.stats import chi2
+from json2txt import registry
+
+# Exact distribution of the sum of k distinct numbers drawn from 1..n, the null
+# of the bins of sums test in hypothesis_tests/test_with_bins_of_sums.R, which
+# enumerates all combn(1:49, 6) draws to get it. Here it is counted by dynamic
+# programming over (count, sum) in O(n k S), so 20 out of 80 takes as long as
+# 6 out of 49 and all games of the registry are covered.
+
+# Number of ways to draw each sum, from 0 to the largest k(2n - k + 1)/2. The
+# counts are Python integers, C(90, 20) doesn't fit in 64 bits.
+@lru_cache(maxsize=None)
+def sum_counts(n, k):
+    top = k * (2 * n - k + 1) // 2
+    counts = np.zeros((k + 1, top + 1), dtype=object)
+    counts[0, 0] = 1
+    for x in range(1, n + 1):
+        counts[1:, x:] = counts[1:, x:] + counts[:-1, :top + 1 - x]
+    return counts[k]
+
+# Probability of every possible sum, indexed by the sum
+def sum_distribution(n, k):
+    counts = sum_counts(n, k)
+    sums = np.arange(k * (k + 1) // 2, len(counts))
+    return pd.Series((counts[sums] / comb(n, k)).astype(float), index=sums)
+
+# Edges of bins of equal probability, the quantiles of the sums of all possible
+# draws at 0, 1/bins, ..., 1 like R's quantile() with its default type 7: between
+# the order statistics around (draws - 1) * p, in exact integer arithmetic
+def sum_edges(n, k, bins=25):
+    cumulative = list(accumulate(sum_counts(n, k)))
+    draws = comb(n, k)
+    edges = []
+    for i in range(bins + 1):
+        low, rest = divmod((draws - 1) * i, bins)
+        below = bisect_right(cumulative, low)
+        above = bisect_right(cumulative, min(low + 1, draws - 1))
+        edges.append(below + rest / bins * (above - below))
+    return np.array(edges)
+
+# Edges and probabilities of the bins of sums test of the R script, with bins
+# (edge[i], edge[i+1]] as cut() makes them, so the smallest sum is in none of them
+def sum_bins(n, k, bins=25):
+    edges = sum_edges(n, k, bins)
+    cdf = np.cumsum(sum_counts(n, k)) / comb(n, k)
+    at = cdf[np.floor(edges).astype(np.intp)].astype(float)
+    return edges, np.diff(at)
+
+# Chi-square of the sums of draws of k out of n against their exact distribution,
+# with the expected counts rescaled to the sums falling in a bin
+def bins_of_sums_test(sums, n, k, bins=25):
+    edges, probs = sum_bins(n, k, bins)
+    index = np.searchsorted(edges, sums, side="left") - 1
+    observed = np.bincount(index[(index >= 0) & (index < bins)], minlength=bins)
+    expected = probs / probs.sum() * observed.sum()
+    statistic = ((observed - expected) ** 2 / expected).sum()
+    return statistic, 1 - chi2.cdf(statistic, bins - 1)
+
+# (n, k) of the main draw of every dataset, n from its range and k from its main numbers
+def games(datasets=registry):
+    return {dataset["name"]: (dataset["range"][1], dataset["main"]) for dataset in datasets}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bins", type=int, default=25)
+    args = parser.parse_args()
+
+    for name, (n, k) in games().items():
+        start = time.perf_counter()
+        distribution = sum_distribution(n, k)
+        seconds = time.perf_counter() - start
+        mean = (distribution.index * distribution).sum()
+        print(f"{name:30} {k:2} of {n}: sums {distribution.index[0]}-{distribution.index[-1]}, mean {mean:.1f}, {seconds:.3f} s")
@@ -1,11 +1,12 @@
 #include <iostream>
 #include <fstream>
 #include <vector>
+#include <cstdlib>
 
 int main(int argc, char **argv) {
     if(argc < 3) {
         std::cout << "Please provide a path to a source file and an output file\n";
-        std::cout << "E.g. use as ./txt2bin {path to source file} {path to output file}\n";
+        std::cout << "E.g. use as ./txt2bin {path to source file} {path to output file} [bits per number, 6 by default]\n";
         return 1;
     }
 
@@ -15,7 +16,13 @@ int main(int argc, char **argv) {
         return 1;
     }
 
-    constexpr uint32_t max_power = 64;  // highest power of 2 s.t. <= highest possible lottery number
+    const int bits = argc > 3 ? std::atoi(argv[3]) : 6;
+    if(bits < 1 || bits > 8) {
+        std::cout << "Bits per number have to be between 1 and 8\n";
+        return 1;
+    }
+
+    const uint32_t max_power = 1u << bits;  // highest power of 2 s.t. <= highest possible lottery number
     uint32_t random_number;
     std::vector<uint32_t> numbers;
     while(source_file >> random_number) {
@@ -37,7 +44,7 @@ int main(int argc, char **argv) {
     uint32_t buffer = 0;
     for(uint8_t number : numbers) {
         buffer |= number << valid_bits;
-        valid_bits += 6;
+        valid_bits += bits;
 
         if(valid_bits >= 8) {
             uint8_t byte = buffer & 0xFF;
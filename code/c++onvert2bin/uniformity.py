@@ -0,0 +1,137 @@
+import argparse
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2
+from json2txt import registry, existing, read_table
+from sums import sum_bins
+from gaps import min_gaps, min_gap_cells
+
+# Uniformity tests on the draws of every game, the Python counterpart of the R
+# scripts in hypothesis_tests. Every test counts the draw matrix of a game with
+# bincount and compares the counts with the ones expected for fair draws, with
+# Pearson's chi-square and the G-test:
+#   frequency  how often every number is drawn
+#   position   how often every number is drawn at every position, only for games
+#              in drawn order
+#   pairs      how often every pair of numbers is drawn together
+#   sums       sums of the draws in 25 bins of equal probability, see sums.py
+#   mindist    minimum distance between the numbers of a draw, as in german_test.R
+# All of them are about the main draw of a game, the bonus numbers of the registry
+# come from drums of their own or after the main numbers and are left out.
+
+# Rows with all k main numbers, by default the ones of the registry, all of them
+# distinct and in the range of the game, and k
+def complete_rows(draws, picks, dataset, k=None):
+    if k is None:
+        k = dataset["main"]
+    low, high = dataset["range"]
+    rows = (picks >= k) & (picks <= dataset["picks"]) & ((draws[:, :k] >= low) & (draws[:, :k] <= high)).all(axis=1)
+    distinct = (np.diff(np.sort(draws[:, :k], axis=1).astype(np.intp), axis=1) != 0).all(axis=1)
+    return rows & distinct, k
+
+# The main numbers of the complete rows as a matrix of k columns numbered from 0, and k
+def complete_draws(draws, picks, dataset, k=None):
+    rows, k = complete_rows(draws, picks, dataset, k)
+    return draws[rows, :k].astype(np.intp) - dataset["range"][0], k
+
+# Chi-square and G statistics, multiplied by scale where drawing without replacement
+# makes the counts vary less than multinomial ones
+def test(observed, expected, df, scale=1):
+    observed, expected = np.asarray(observed, dtype=float), np.asarray(expected, dtype=float)
+    chisq = scale * ((observed - expected) ** 2 / expected).sum()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        g = scale * 2 * np.where(observed > 0, observed * np.log(observed / expected), 0).sum()
+    return {"chisq": chisq, "g": g, "df": df, "p_chisq": chi2.sf(chisq, df), "p_g": chi2.sf(g, df)}
+
+# The counts of k different numbers per draw have variance (n - k) / (n - 1) times
+# the multinomial one, corrected for so the statistic is chi-square with n - 1
+# degrees of freedom
+def frequency(draws, size):
+    k = draws.shape[1]
+    observed = np.bincount(draws.ravel(), minlength=size)
+    return test(observed, np.full(size, draws.size / size), size - 1, (size - 1) / (size - k))
+
+# Every position is a chi-square on its own, their sum has k (size - 1) degrees of freedom
+def position(draws, size):
+    k = draws.shape[1]
+    observed = np.bincount((np.arange(k) * size + draws).ravel(), minlength=k * size)
+    return test(observed, np.full(k * size, len(draws) / size), k * (size - 1))
+
+# A pair is in a draw with probability p = k (k - 1) / n (n - 1), but pairs sharing
+# a number or not aren't independent. The covariance of the pair counts has the
+# eigenvalues lambda of the Johnson scheme J(n, 2), with multiplicities n - 1 and
+# n (n - 3) / 2, so the chi-square is a sum of two scaled chi-squares. It is
+# matched to one by its mean and variance (Satterthwaite).
+def pair_scale(n, k):
+    p = k * (k - 1) / (n * (n - 1))
+    one = k * (k - 1) * (k - 2) / (n * (n - 1) * (n - 2)) - p * p
+    none = k * (k - 1) * (k - 2) * (k - 3) / (n * (n - 1) * (n - 2) * (n - 3)) - p * p
+    lambdas = p * (1 - p) + one * np.array([n - 4, -2]) + none * np.array([-(n - 3), 1])
+    multiplicities = np.array([n - 1, n * (n - 3) / 2])
+
+    mean = (lambdas * multiplicities).sum() / p
+    variance = 2 * (lambdas ** 2 * multiplicities).sum() / p ** 2
+    return 2 * mean / variance, 2 * mean ** 2 / variance
+
+def pairs(draws, size):
+    k = draws.shape[1]
+    first, second = np.triu_indices(k, 1)
+    low = np.minimum(draws[:, first], draws[:, second])
+    high = np.maximum(draws[:, first], draws[:, second])
+    observed = np.bincount((low * size + high).ravel(), minlength=size * size)
+    observed = observed.reshape(size, size)[np.triu_indices(size, 1)]
+
+    scale, df = pair_scale(size, k)
+    return test(observed, np.full(len(observed), low.size / len(observed)), df, scale)
+
+def sums(draws, size):
+    n, k = size, draws.shape[1]
+    edges, probs = sum_bins(n, k)
+    index = np.searchsorted(edges, (draws + 1).sum(axis=1), side="left") - 1
+    observed = np.bincount(index[(index >= 0) & (index < len(probs))], minlength=len(probs))
+    return test(observed, probs / probs.sum() * observed.sum(), len(probs) - 1)
+
+def mindist(draws, size):
+    observed, expected = min_gap_cells(min_gaps(draws), size, draws.shape[1])
+    return test(observed, expected, len(expected) - 1)
+
+statistics = {
+    "frequency": frequency,
+    "position": position,
+    "pairs": pairs,
+    "sums": sums,
+    "mindist": mindist
+}
+
+def uniformity(dataset, names=statistics):
+    draws, k = complete_draws(*read_table(dataset)[:2], dataset)
+    size = dataset["range"][1] - dataset["range"][0] + 1
+
+    rows = []
+    for name in names:
+        if name == "position" and dataset["order"][0] != "D":
+            continue
+        if name == "mindist" and k < 2:
+            continue
+        rows.append({"game": dataset["name"], "draws": len(draws), "k": k, "n": size,
+                     "statistic": name, **statistics[name](draws, size)})
+    return rows
+
+# Test results of all datasets in one table, one row per game and statistic
+def run(datasets=registry, names=statistics):
+    rows = []
+    for dataset in existing(datasets):
+        rows += uniformity(dataset, names)
+    return pd.DataFrame(rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--statistics", nargs="+", choices=list(statistics), default=list(statistics))
+    parser.add_argument("--out", help="write the results to this CSV file")
+    args = parser.parse_args()
+
+    results = run(registry, args.statistics)
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(results)
+    if args.out:
+        results.to_csv(args.out, index=False)
@@ -0,0 +1,130 @@
+import argparse
+import json
+import os
+import numpy as np
+import pandas as pd
+
+# Checks of the draws of a dataset before they are converted, on the whole draw
+# matrix of read_table() at once. Every check marks the draws failing it:
+#   missing     fewer numbers than the dataset's picks, e.g. empty cells
+#   extra       more numbers than the dataset's picks
+#   range       a number outside the range of the game, e.g. a 0 or an 89 out of 80,
+#               or for the bonus numbers outside their own range
+#   duplicates  a number twice among the main numbers of one draw, bonus numbers
+#               can repeat main ones when they come from a drum of their own
+#   dates       a date that couldn't be parsed, only reported
+# Draws that are missing, extra or out of range are dropped by the readers, draws with
+# duplicates are kept.
+#
+# The number of draws failing every check is recorded per dataset in the baseline.
+# Reading a dataset fails if more draws are dropped than in the baseline, or if a
+# dataset without duplicates before gets some, so a broken source never ends up in a
+# packed file. After fixing or accepting the new counts, record them with
+#   python code/c++onvert2bin/validation.py --update
+
+baseline_path = "data/validation.json"
+dropped = ["missing", "extra", "range"]
+
+# Lowest and highest number of every column of the draw matrix: the range of the
+# game for the main numbers, their own range for the bonus numbers after them
+def column_ranges(dataset, columns):
+    ranges = [dataset["range"]] * dataset["main"] + [tuple(r) for r in dataset["bonus"]]
+    ranges += [dataset["range"]] * max(0, columns - len(ranges))
+    return np.array(ranges[:columns], dtype=np.intp).reshape(-1, 2).T
+
+def check(draws, picks, dataset, dates=None):
+    filled = np.arange(draws.shape[1]) < picks[:, None]
+    low, high = column_ranges(dataset, draws.shape[1])
+    main = min(dataset["main"], draws.shape[1])
+    ordered = np.sort(np.where(filled[:, :main], draws[:, :main], 0), axis=1)
+
+    masks = {
+        "missing": picks < dataset["picks"],
+        "extra": picks > dataset["picks"],
+        "range": (((draws < low) | (draws > high)) & filled).any(axis=1),
+        "duplicates": ((np.diff(ordered, axis=1) == 0) & (ordered[:, 1:] > 0)).any(axis=1)
+    }
+    if dates is not None:
+        masks["dates"] = np.isnat(np.asarray(dates, dtype="datetime64[ns]"))
+    return masks
+
+def valid(masks):
+    return ~np.logical_or.reduce([masks[name] for name in dropped])
+
+def counts(masks):
+    return {name: int(mask.sum()) for name, mask in masks.items()}
+
+def read_baseline(path=baseline_path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+# What got worse in the counts of a dataset compared with its baseline
+def regressions(name, counts, baseline):
+    messages = [f"{counts[check]} draws dropped as {check} instead of {baseline.get(check, 0)}"
+                for check in dropped if counts[check] > baseline.get(check, 0)]
+    if counts["duplicates"] > 0 and baseline.get("duplicates", 0) == 0:
+        messages.append(f"{counts['duplicates']} draws with duplicates instead of none")
+    return [f"{name}: {message}" for message in messages]
+
+# Checks of a dataset read in chunks. The counts of every chunk are added up, so the
+# baseline is compared with the counts of the whole dataset read so far and the
+# dropped draws are reported once, by report() after the last chunk.
+class validator:
+    def __init__(self, dataset, baseline=None):
+        self.dataset = dataset
+        self.baseline = (read_baseline() if baseline is None else baseline).get(dataset["name"], {})
+        self.counts = dict.fromkeys([*dropped, "duplicates"], 0)
+        self.draws = 0
+        self.kept = 0
+
+    # Mask of the draws of the chunk to keep, without the ones failing the checks, after
+    # making sure no more of them fail than in the baseline. Raises ValueError otherwise.
+    def update(self, draws, picks):
+        masks = check(draws, picks, self.dataset)
+        for name, count in counts(masks).items():
+            self.counts[name] += count
+        failed = regressions(self.dataset["name"], self.counts, self.baseline)
+        if failed:
+            raise ValueError("; ".join(failed) + f", see {baseline_path}")
+
+        keep = valid(masks)
+        self.draws += len(keep)
+        self.kept += int(keep.sum())
+        return keep
+
+    def report(self):
+        if self.kept < self.draws:
+            print(f"{self.dataset['name']}: dropped {self.draws - self.kept} of {self.draws} draws")
+
+# validator() of a dataset read at once
+def validate(draws, picks, dataset, baseline=None):
+    checks = validator(dataset, baseline)
+    keep = checks.update(draws, picks)
+    checks.report()
+    return keep
+
+if __name__ == "__main__":
+    from json2txt import registry, existing, read_table
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--update", action="store_true", help=f"record the counts as the new baseline in {baseline_path}")
+    args = parser.parse_args()
+
+    baseline = read_baseline()
+    rows, failed = {}, []
+    for dataset in existing(registry):
+        draws, picks, dates = read_table(dataset)
+        rows[dataset["name"]] = {"draws": len(picks), **counts(check(draws, picks, dataset, dates))}
+        failed += regressions(dataset["name"], rows[dataset["name"]], baseline.get(dataset["name"], {}))
+
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(pd.DataFrame.from_dict(rows, orient="index"))
+
+    if args.update:
+        with open(baseline_path, "w") as f:
+            json.dump({**baseline, **{name: {check: row[check] for check in [*dropped, "duplicates"]}
+                                      for name, row in rows.items()}}, f, indent=4)
+    elif failed:
+        raise SystemExit("\n".join(failed))
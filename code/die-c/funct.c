@@ -1,6 +1,11 @@
 #include "header.h"
 #include "macro.h"
 
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+
 /*gamma(z) when 2z is a integer*/
 double G(double z)
 {
@@ -38,20 +43,22 @@ int fcmpr(const void *f1, const void *f2)
 }
 
 /*read in a uniform random number from a file*/
+/*the file is memory mapped on first use and stays mapped, every test walks*/
+/*through the mapping again from the start instead of rereading the file*/
 uniform uni(char *filename)
 {
-  static FILE *infile;
+  static char *mapped=NULL;
+  static unsigned char *map=NULL;
+  static size_t map_size=0, offset=0;
 
   static char isopen='n';
   static counter count=DIM;
-  static uniform uniran[DIM];
+  static uniform *uniran=NULL;
+  static uniform tail[DIM];   /*last block when the file ends within it*/
 
   static counter bytes_read;
 
- /* uniform fortran[1]; */ 
-
   if( strcmp(filename, "close")==0 ){
-    fclose(infile);
     isopen='n';
     count=DIM;
     printf("\n========================================\n");
@@ -64,18 +71,47 @@ uniform uni(char *filename)
   }
 
   if( isopen=='n' ){
-    infile=fopen(filename, "rb");
-    if(infile == NULL){
-      printf("can't open file %s!!!\n", filename);
-      exit(1);
+    if( mapped==NULL || strcmp(mapped, filename)!=0 ){
+      int fd=open(filename, O_RDONLY);
+      struct stat st;
+
+      if(fd<0 || fstat(fd, &st)<0){
+        printf("can't open file %s!!!\n", filename);
+        exit(1);
+      }
+
+      if(map!=NULL) munmap(map, map_size);
+      free(mapped);
+
+      map_size=st.st_size;
+      map=NULL;
+      if(map_size>0){
+        map=mmap(NULL, map_size, PROT_READ, MAP_PRIVATE, fd, 0);
+        if(map==MAP_FAILED){
+          printf("can't map file %s!!!\n", filename);
+          exit(1);
+        }
+        madvise(map, map_size, MADV_SEQUENTIAL);
+      }
+      close(fd);
+      mapped=strdup(filename);
     }
+
+    offset=0;
     bytes_read = 0;
     isopen='y';
-/*fread( fortran, sizeof(uniform), 1 , infile );*/ /*for binary file written*/
-                                                   /*by fortran program*/
   }
 
-  fread( uniran, sizeof(uniform), DIM , infile );
+  if( offset+sizeof(uniform)*DIM <= map_size ){
+    uniran=(uniform*)(map+offset);
+  }
+  else{
+    /*like fread, keep the previous block where the file has no more bytes*/
+    if( uniran!=NULL && uniran!=tail ) memcpy(tail, uniran, sizeof(tail));
+    if( offset<map_size ) memcpy(tail, map+offset, map_size-offset);
+    uniran=tail;
+  }
+  offset=MIN(offset+sizeof(uniform)*DIM, map_size);
 
   static counter info_index = 0;
   static counter milestones[] = {16383UL, 65535UL, 262143UL, 488447UL};
@@ -86,8 +122,6 @@ uniform uni(char *filename)
   bytes_read += sizeof(uniform) * DIM;  
 
   count=0;
-/*fread( fortran, sizeof(uniform), 1 , infile );
-fread( fortran, sizeof(uniform), 1 , infile );*/
 
   return uniran[count];
 }
@@ -0,0 +1,50 @@
+import os
+import numpy as np
+import pandas as pd
+from .birthday import birthday
+from .rank import rank_31x31, rank_32x32, rank_6x8
+from .count1s import count_1s_stream, count_1s_specific
+from .parking import parking
+from .mindist import mindist
+from .spheres import spheres
+from .squeeze import squeeze
+from .osum import osum
+from .runs import runs
+from .craps import craps
+
+# NumPy versions of the tests of die-c, run on uint32 words instead of a file.
+# Every test reads the words from the start, as diehard does, and returns its
+# p-values by sub-test. Like diehard, a test needing more words than given reuses
+# the last block of 4096 words, see stats.uni.
+
+tests = {
+    "Birthday": birthday,
+    "Binary rank 31x31": rank_31x31,
+    "Binary rank 32x32": rank_32x32,
+    "Binary rank 6x8": rank_6x8,
+    "Count 1s stream": count_1s_stream,
+    "Count 1s specific": count_1s_specific,
+    "Parking": parking,
+    "Mindist": mindist,
+    "3D spheres": spheres,
+    "Squeeze": squeeze,
+    "Overlapping sums": osum,
+    "Runs": runs,
+    "Craps": craps
+}
+
+# Words of a file packed for diehard, memory mapped. Bytes not making up a last
+# word are left out.
+def load(path):
+    size = os.path.getsize(path) // 4
+    if size == 0:
+        return np.zeros(0, dtype=np.uint32)
+    return np.memmap(path, dtype=np.uint32, mode="r", shape=(size,))
+
+# p-values of the given tests, all by default, one row per sub-test
+def battery(words, names=None):
+    rows = []
+    for name in names or tests:
+        for subtest, p in tests[name](words).items():
+            rows.append({"test": name, "subtest": subtest, "p_value": float(p)})
+    return pd.DataFrame(rows, columns=["test", "subtest", "p_value"])
@@ -0,0 +1,12 @@
+import argparse
+import pandas as pd
+from . import tests, load, battery
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m diehard")
+    parser.add_argument("file", help="binary file, e.g. one written by json2txt.py --pack")
+    parser.add_argument("--tests", nargs="+", choices=list(tests), metavar="TEST", help=f"tests to run, out of {list(tests)}")
+    args = parser.parse_args()
+
+    with pd.option_context("display.max_rows", None, "display.float_format", "{:.6f}".format):
+        print(battery(load(args.file), args.tests).to_string(index=False))
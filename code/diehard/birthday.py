@@ -0,0 +1,56 @@
+import numpy as np
+from .stats import uni, Poisson, Chisq, KStest
+
+# Birthday spacings, cdbday.c. 500 samples of 1024 birthdays in a year of 2^24
+# days are taken from each 24 bit window of the same words. The number of
+# repeated spacings between the sorted birthdays is asymptotically Poisson with
+# mean 1024^3 / (4 * 2^24) = 16.
+
+no_obs, no_bday, no_bits = 500, 1024, 24
+mean = no_bday ** 3 / (4 * 2 ** no_bits)
+
+# Chi-square of the observed counts against the Poisson distribution, pooling
+# the classes so every class expects at least 5 counts, as P_fit() does
+def P_fit(mean, obs):
+    obs = np.sort(obs)
+    no_obs = len(obs)
+    expected, observed = [], []
+    i, k, rest = -1, 0, no_obs
+
+    while True:
+        Ef = 0
+        while Ef < 5:
+            i += 1
+            Ef += no_obs * Poisson(mean, i)
+        f = np.searchsorted(obs, i, side="right") - k
+        k += f
+
+        rest -= Ef
+        if rest < 5:
+            Ef += rest
+            f += no_obs - k
+        expected.append(Ef)
+        observed.append(f)
+        if rest < 5 or len(expected) == no_obs // 5:
+            break
+
+    expected, observed = np.array(expected), np.array(observed)
+    chisq = ((observed - expected) ** 2 / expected).sum()
+    return 1 - Chisq(len(expected) - 1, chisq)
+
+def duplicate_spacings(days):
+    days = np.sort(days, axis=1)
+    spacings = np.concatenate((days[:, :1], np.diff(days, axis=1)), axis=1)
+    return (np.diff(np.sort(spacings, axis=1), axis=1) == 0).sum(axis=1)
+
+def birthday(words):
+    words = uni(words, no_obs * no_bday).reshape(no_obs, no_bday)
+    mask = np.uint32(2 ** no_bits - 1)
+
+    p = {}
+    for rt in range(32 - no_bits, -1, -1):
+        obs = duplicate_spacings((words >> np.uint32(rt)) & mask)
+        p[f"bits {33 - no_bits - rt} to {32 - rt}"] = P_fit(mean, obs)
+
+    p["KS"] = KStest(list(p.values()))
+    return p
@@ -0,0 +1,49 @@
+import numpy as np
+from .stats import uni, Phi
+
+# Count the 1s, cnt1s.c. Every byte becomes a letter by its number of 1s,
+# A for 0-2, B for 3, C for 4, D for 5 and E for 6-8. The counts of the
+# overlapping 5 letter words are tested with Q5 - Q4, the difference of the
+# chi-squares of the 5 and 4 letter words, which is close to normal with mean
+# 2500 and variance 5000.
+
+prob = np.array([37, 56, 70, 56, 37]) / 256
+mean, std = 2500, np.sqrt(5000)
+
+popcount = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+letters = np.select([popcount < 3, popcount == 3, popcount == 4, popcount == 5], [0, 1, 2, 3], 4)
+
+# Expected frequencies of all words of the given number of letters
+def expected(no_wds, length):
+    Ef = np.full(1, float(no_wds))
+    for _ in range(length):
+        Ef = np.multiply.outer(Ef, prob).ravel()
+    return Ef
+
+def cnt_stat(bytes, no_wds):
+    ltr = letters[bytes].astype(np.intp)
+    wd = 625 * ltr[1:-4] + 125 * ltr[2:-3] + 25 * ltr[3:-2] + 5 * ltr[4:-1] + ltr[5:]
+    f4 = np.bincount(wd // 5, minlength=625)
+    f5 = np.bincount(wd, minlength=3125)
+
+    Ef4, Ef5 = expected(no_wds, 4), expected(no_wds, 5)
+    chsq = ((f5 - Ef5) ** 2 / Ef5).sum() - ((f4 - Ef4) ** 2 / Ef4).sum()
+    return 1 - Phi((chsq - mean) / std)
+
+# The bytes of the words as a stream, most significant byte first
+def count_1s_stream(words):
+    no_wds = 2560000
+    words = uni(words, -(-(no_wds + 4) // 4))
+    bytes = words.astype(">u4").view(np.uint8)[:no_wds + 4]
+    return {"stream": cnt_stat(bytes, no_wds)}
+
+# One byte of every word, for each position of the byte
+def count_1s_specific(words):
+    no_wds = 256000
+    words = uni(words, no_wds + 4)
+
+    p = {}
+    for rt in range(24, -1, -1):
+        bytes = ((words >> np.uint32(rt)) & np.uint32(255)).astype(np.uint8)
+        p[f"bits {25 - rt} to {32 - rt}"] = cnt_stat(bytes, no_wds)
+    return p
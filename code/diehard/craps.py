@@ -0,0 +1,55 @@
+import numpy as np
+from .stats import uni, Phi, Chisq
+
+# Craps, craptest.c. 200000 games of craps are played. The number of wins is
+# close to normal with mean 244/495 of the games, the number of throws per game,
+# 21 or more pooled, is tested with a chi-square against its distribution.
+
+no_games = 200000
+
+k = np.arange(19)
+Ef = np.append(1 / 3., (27 * (27 / 36.) ** k + 40 * (26 / 36.) ** k + 55 * (25 / 36.) ** k) / 648)
+Ef = np.append(Ef, 1. - Ef.sum())
+
+# Index of the next throw of every value from each throw on, n where there is none
+def next_throw(throws, value):
+    n = len(throws)
+    at = np.where(throws == value, np.arange(n), n)
+    return np.minimum.accumulate(at[::-1])[::-1]
+
+# Games played on the throws, each starting with the throw after the last one.
+# The end of a game started on every throw is found for all throws at once.
+def play(throws):
+    n = len(throws)
+    seven = np.append(next_throw(throws, 7), n)
+    end = np.arange(n)
+    for point in [4, 5, 6, 8, 9, 10]:
+        at = np.append(next_throw(throws, point), n)
+        started = throws == point
+        end[started] = np.minimum(seven[1:], at[1:])[started]
+    win = np.isin(throws, [7, 11]) | ((end > np.arange(n)) & (end < n) & (throws[np.minimum(end, n - 1)] != 7))
+
+    start, games = 0, []
+    end, win = end.tolist(), win.tolist()
+    while len(games) < no_games and start < n and end[start] < n:
+        games.append((win[start], end[start] - start))
+        start = end[start] + 1
+    return games
+
+def craps(words):
+    n = 4 * no_games        # enough for the mean of 3.38 throws per game
+    while True:
+        dice = 1 + ((6 * uni(words, 2 * n).astype(np.uint64)) >> np.uint64(32))
+        games = play((dice[0::2] + dice[1::2]).astype(np.intp))
+        if len(games) == no_games:
+            break
+        n *= 2
+
+    win, no_throw = np.array(games).T
+    mean = 244 * no_games / 495.
+    std = np.sqrt(mean * 251 / 495.)
+    t = (win.sum() - mean) / std
+
+    f = np.bincount(np.minimum(20, no_throw), minlength=21)
+    chsq = ((f - no_games * Ef) ** 2 / (no_games * Ef)).sum()
+    return {"wins": 1 - Phi(t), "throws/game": 1 - Chisq(20, chsq)}
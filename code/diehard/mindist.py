@@ -0,0 +1,31 @@
+import numpy as np
+from .stats import uni, UNIMAX, KStest
+
+# Minimum distance, mindist.c. 8000 points are placed in a square of side 10000.
+# The square of the minimum distance between them is close to exponential with
+# mean .995, so 1 - exp(-d^2 / .995) is uniform.
+
+no_pts, no_smpl, side = 8000, 100, 10000
+
+# Squared minimum distance between the points of every sample, samples x points x
+# coordinates, sweeping along the first coordinate like the C code but over all
+# samples at once: pairs gap points apart in sorted order are compared until no
+# pair is closer along the first coordinate than the minimum found so far
+def min_distance(points):
+    points = np.take_along_axis(points, points[:, :, :1].argsort(axis=1, kind="stable"), axis=1)
+    dmin = np.full(len(points), np.inf)
+
+    for gap in range(1, points.shape[1]):
+        d = points[:, gap:] - points[:, :-gap]
+        d0 = d[:, :, 0] * d[:, :, 0]
+        if (d0.min(axis=1) > dmin).all():
+            break
+        d = d0 + (d[:, :, 1:] * d[:, :, 1:]).sum(axis=2)
+        dmin = np.minimum(dmin, d.min(axis=1))
+    return dmin
+
+def mindist(words):
+    points = uni(words, no_smpl * no_pts * 2).reshape(no_smpl, no_pts, 2)
+    dmin = min_distance(points * (side / UNIMAX))
+    p = 1 - np.exp(-dmin / .995)
+    return {**{f"sample {i + 1}": v for i, v in enumerate(p)}, "KS": KStest(p)}
@@ -0,0 +1,60 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from . import tests, battery
+from .runner import source, write_results
+
+# Null distribution of the p-values of a source: the tests run on many streams of
+# random words of the same length as the source. The streams are independent,
+# spawned from one SeedSequence, first one per source and then one per run, so a
+# run gives the same words whatever the number of jobs.
+#
+# The results have the columns of diehard.runner with a run column added, e.g.
+#   PYTHONPATH=code python -m diehard.null data/big_data/DC_Keno.bin --runs 1000
+
+null_path = "data/diehard/null.parquet"
+
+def null_run(seed, size, names):
+    words = np.random.default_rng(seed).integers(0, 2 ** 32, size=size, dtype=np.uint32)
+    return battery(words, names)
+
+# p-values of the tests on runs random streams of size words, seeded by the
+# children of the SeedSequence seed
+def null_runs(size, runs, seed, names=None, jobs=1):
+    seeds = seed.spawn(runs)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        frames = list(executor.map(partial(null_run, size=size, names=names), seeds, chunksize=max(1, runs // (4 * jobs))))
+    return pd.concat([frame.assign(run=i) for i, frame in enumerate(frames)], ignore_index=True)
+
+# Null runs as long as each of the files
+def null_sources(paths, runs, seed=0, names=None, jobs=1):
+    seeds = np.random.SeedSequence(seed).spawn(len(paths))
+    frames = []
+    for path, child in zip(paths, seeds):
+        frame = null_runs(os.path.getsize(path) // 4, runs, child, names, jobs)
+        frame.insert(0, "source", source(path))
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+# Pointwise quantiles of the sorted p-values of the null runs of a source, the band
+# the sorted p-values of the source should stay within in a P-P plot. KS tests
+# summarizing the sub-tests are left out, like plot_pvalue_distributions does.
+def envelope(null, name, level=.95):
+    null = null[(null["source"] == name) & (null["subtest"] != "KS")]
+    runs = np.sort(null.pivot(index="run", columns=["test", "subtest"], values="p_value").to_numpy(), axis=1)
+    return np.quantile(runs, [(1 - level) / 2, (1 + level) / 2], axis=0)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m diehard.null")
+    parser.add_argument("files", nargs="+", help="binary files whose lengths the null runs take")
+    parser.add_argument("--runs", type=int, default=1000, help="number of null runs per file")
+    parser.add_argument("--seed", type=int, default=0, help="entropy of the root SeedSequence")
+    parser.add_argument("--tests", nargs="+", choices=list(tests), metavar="TEST", help=f"tests to run, out of {list(tests)}")
+    parser.add_argument("--out", default=null_path, help="results table, .csv or .parquet")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="number of worker processes")
+    args = parser.parse_args()
+
+    write_results(null_sources(args.files, args.runs, args.seed, args.tests, args.jobs), args.out)
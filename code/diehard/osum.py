@@ -0,0 +1,27 @@
+import numpy as np
+from .stats import uni, uniform, Phi, KStest
+
+# Overlapping sums, cdosum.c. The sums of 100 consecutive uniforms overlapping in
+# all but one of them are turned into 100 independent normals, whose uniformity
+# after Phi is tested. Ten tests are made of 100 such sequences each.
+
+no_obs, no_sum, no_num = 10, 100, 100
+mean, rstd = .5 * no_num, np.sqrt(12)
+
+def osum(words):
+    u = uniform(uni(words, no_obs * no_sum * (2 * no_num - 1)).reshape(no_obs, no_sum, 2 * no_num - 1))
+    first, new = u[:, :, :no_num], u[:, :, no_num:]
+
+    # sums of the first numbers, then with the oldest number replaced by a new one
+    sums = first.sum(axis=2, keepdims=True) + np.cumsum(new - first[:, :, :-1], axis=2)
+    y = (np.concatenate((first.sum(axis=2, keepdims=True), sums), axis=2) - mean) * rstd
+
+    x = np.empty_like(y)
+    x[..., 0] = y[..., 0] / np.sqrt(no_num)
+    x[..., 1] = -x[..., 0] * (no_num - 1) / np.sqrt(2 * no_num - 1.) + y[..., 1] * np.sqrt(no_num / (2 * no_num - 1.))
+    a = 2 * no_num + 1 - np.arange(2, no_num)
+    b = 2 * a - 2
+    x[..., 2:] = y[..., :1] / np.sqrt(a * b) - np.sqrt((a - 1) / (b + 2)) * y[..., 1:-1] + y[..., 2:] * np.sqrt(a / b)
+
+    p = KStest(KStest(Phi(x)))
+    return {**{f"test {i + 1}": v for i, v in enumerate(p)}, "KS": KStest(p)}
@@ -0,0 +1,37 @@
+import numpy as np
+from .stats import uni, UNIMAX, Phi, KStest
+
+# Parking lot, cdpark.c. Cars, squares of side 1, are parked one after the other
+# at random places of a lot of side 100. A car crashing into one parked before
+# is left out. After 12000 tries about 3523 cars are parked, with sigma 21.9.
+# cdpark.c frees the p-values before its KS test, so only the p-values of the
+# samples are the same as in diehard's report, not the one of the KS test.
+
+no_obs, side, no_trials = 10, 100, 12000
+mu, sigma = 3523, 21.9
+
+# Number of cars parked from the points, in order. Parked cars are at least 1
+# apart in one direction, so every unit cell of the lot holds at most one of them
+# and a new car only has to be checked against the 9 cells around it.
+def no_parked(x, y):
+    cells = np.full((side + 2, side + 2), -1, dtype=np.intp)
+    cx, cy = x.astype(np.intp) + 1, y.astype(np.intp) + 1
+    x, y = x.tolist(), y.tolist()
+
+    parked = 0
+    for j, (i, k) in enumerate(zip(cx.tolist(), cy.tolist())):
+        around = cells[i - 1:i + 2, k - 1:k + 2].ravel()
+        if any(abs(x[c] - x[j]) <= 1 and abs(y[c] - y[j]) <= 1 for c in around[around >= 0].tolist()):
+            continue
+        cells[i, k] = j
+        parked += 1
+    return parked
+
+def parking(words):
+    points = uni(words, no_obs * (no_trials + 1) * 2).reshape(no_obs, no_trials + 1, 2)
+    points = points * (side / UNIMAX)
+
+    z = (np.array([no_parked(p[:, 0], p[:, 1]) for p in points]) - mu) / sigma
+    p = 1 - Phi(z)
+
+    return {**{f"sample {i + 1}": v for i, v in enumerate(p)}, "KS": KStest(p)}
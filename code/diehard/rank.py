@@ -0,0 +1,62 @@
+import numpy as np
+from .stats import uni, Chisq, KStest
+
+# Ranks of binary matrices, cdbinrnk.c. For 31x31 matrices every row is the 31
+# leftmost bits of a word, for 32x32 matrices a whole word and for 6x8 matrices a
+# byte of the word, once for every position of the byte. The counts of the ranks
+# are compared with their probabilities for random matrices.
+
+p30 = [.0052854502, .1283502644, .5775761902, .2887880952]
+p6 = [.009443, 0.217439, 0.773118]
+
+# Ranks over GF(2) of a stack of matrices, one matrix per row of rows, every
+# matrix row given by the bits of an integer
+def ranks(rows, no_col):
+    rows = rows.copy()
+    no_mtr, no_row = rows.shape
+    rank = np.zeros(no_mtr, dtype=np.intp)
+    index = np.arange(no_row)
+    matrices = np.arange(no_mtr)
+
+    for rt in range(no_col):
+        bit = ((rows >> rt) & 1).astype(bool)
+        candidates = bit & (index >= rank[:, None])
+        found = candidates.any(axis=1)
+        m, pivot, k = matrices[found], candidates[found].argmax(axis=1), rank[found]
+
+        # swap the pivot row up to the rank and clear the bit in the rows below
+        pivot_row = rows[m, pivot]
+        rows[m, pivot] = rows[m, k]
+        rows[m, k] = pivot_row
+        below = ((rows[m] >> rt) & 1).astype(bool) & (index > k[:, None])
+        rows[m] ^= np.where(below, pivot_row[:, None], 0).astype(rows.dtype)
+
+        rank[found] += 1
+
+    return rank
+
+def rnk_stat(rows, no_col, llim, p):
+    cls = np.maximum(llim, ranks(rows, no_col)) - llim
+    f = np.bincount(cls, minlength=len(p))
+    Ef = rows.shape[0] * np.asarray(p)
+    chsq = ((f - Ef) ** 2 / Ef).sum()
+    return 1 - Chisq(len(p) - 1, chsq)
+
+def rank_31x31(words):
+    rows = uni(words, 40000 * 31).reshape(40000, 31) >> np.uint32(1)
+    return {"31x31": rnk_stat(rows, 31, 28, p30)}
+
+def rank_32x32(words):
+    rows = uni(words, 40000 * 32).reshape(40000, 32)
+    return {"32x32": rnk_stat(rows, 32, 29, p30)}
+
+def rank_6x8(words):
+    words = uni(words, 100000 * 6).reshape(100000, 6)
+
+    p = {}
+    for rt in range(24, -1, -1):
+        rows = ((words >> np.uint32(rt)) & np.uint32(255)).astype(np.uint8)
+        p[f"bits {25 - rt} to {32 - rt}"] = rnk_stat(rows, 8, 4, p6)
+
+    p["KS"] = KStest(list(p.values()))
+    return p
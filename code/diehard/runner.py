@@ -0,0 +1,111 @@
+import argparse
+import json
+import os
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from . import tests, load, battery
+
+# Runs the tests on many packed files at once, one job per file and test, and
+# collects the p-values into one table with the columns source (the file name
+# without extension), path, test, subtest and p_value.
+#
+# Every finished job is written on its own to {out}.parts/{source}/{test}.csv, so
+# a run stopped for whatever reason is picked up where it stopped when started
+# again: jobs are skipped when their part exists and the file has the same size
+# and modification time as when the part was written. The table is written to out
+# as CSV, or by the extension as Parquet or as JSON keyed by source, test and
+# subtest: {"DC_Keno": {"Birthday": {"bits 1 to 24": 0.54, ...}, ...}, ...}
+# Run from the repository root as:
+#   PYTHONPATH=code python -m diehard.runner data/big_data/*.bin --jobs 8
+
+results_path = "data/diehard/results.csv"
+
+def source(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+def part_path(parts_dir, path, test):
+    return os.path.join(parts_dir, source(path), test.replace(" ", "_") + ".csv")
+
+def stamp(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+def finished(part, path):
+    if not os.path.exists(part):
+        return False
+    frame = pd.read_csv(part)
+    return len(frame) > 0 and (frame["size"].iloc[0], frame["mtime"].iloc[0]) == stamp(path)
+
+def run_job(path, test):
+    size, mtime = stamp(path)
+    frame = battery(load(path), [test])
+    frame.insert(0, "path", path)
+    frame.insert(0, "source", source(path))
+    frame["size"], frame["mtime"] = size, mtime
+    return frame
+
+# Written next to its final name first, so a crash never leaves half a part behind
+def write_part(frame, part):
+    os.makedirs(os.path.dirname(part), exist_ok=True)
+    frame.to_csv(part + ".tmp", index=False)
+    os.replace(part + ".tmp", part)
+
+def collect(paths, names, parts_dir):
+    frames = [pd.read_csv(part_path(parts_dir, path, test)) for path in paths for test in names]
+    return pd.concat(frames, ignore_index=True).drop(columns=["size", "mtime"])
+
+def write_results(frame, out):
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    if out.endswith(".parquet"):
+        frame.to_parquet(out, index=False)
+    elif out.endswith(".json"):
+        nested = {}
+        for row in frame.itertuples():
+            nested.setdefault(row.source, {}).setdefault(row.test, {})[row.subtest] = row.p_value
+        with open(out, "w") as f:
+            json.dump(nested, f, indent=4)
+    else:
+        frame.to_csv(out, index=False)
+
+# The table written by write_results, without the paths for JSON
+def read_results(path):
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    if path.endswith(".json"):
+        with open(path) as f:
+            nested = json.load(f)
+        return pd.DataFrame(
+            [(source, test, subtest, p) for source, results in nested.items()
+             for test, subtests in results.items() for subtest, p in subtests.items()],
+            columns=["source", "test", "subtest", "p_value"]
+        )
+    return pd.read_csv(path)
+
+# p-values of the tests on all files, in the order of the files and tests
+def run(paths, names=None, out=results_path, jobs=1):
+    names = names or list(tests)
+    parts_dir = out + ".parts"
+    pending = [(path, test) for path in paths for test in names
+               if not finished(part_path(parts_dir, path, test), path)]
+    print(f"{len(paths) * len(names) - len(pending)} of {len(paths) * len(names)} jobs done before, running {len(pending)}")
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(run_job, path, test): (path, test) for path, test in pending}
+        for future in as_completed(futures):
+            path, test = futures[future]
+            write_part(future.result(), part_path(parts_dir, path, test))
+            print(f"{source(path)}: {test} done")
+
+    results = collect(paths, names, parts_dir)
+    write_results(results, out)
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m diehard.runner")
+    parser.add_argument("files", nargs="+", help="binary files, e.g. ones written by json2txt.py --pack")
+    parser.add_argument("--tests", nargs="+", choices=list(tests), metavar="TEST", help=f"tests to run, out of {list(tests)}")
+    parser.add_argument("--out", default=results_path, help="results table, .csv, .parquet or .json")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="number of worker processes")
+    args = parser.parse_args()
+
+    run(args.files, args.tests, args.out, args.jobs)
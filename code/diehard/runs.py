@@ -0,0 +1,58 @@
+import numpy as np
+from .stats import uni, uniform, Chisq, KStest
+
+# Runs up and down, runtest.c (algorithm AS 157). The lengths of the runs up and
+# down of 10 sequences of 10000 uniforms, counted as 1 to 5 and 6 or more, give
+# statistics that are chi-square with 6 degrees of freedom. Done twice.
+
+no_sets, no_seqs, length = 2, 10, 10000
+
+a = np.array([
+    [4529.4, 9044.9, 13568., 18091., 22615., 27892.],
+    [9044.9, 18097., 27139., 36187., 45234., 55789.],
+    [13568., 27139., 40721., 54281., 67852., 83685.],
+    [18091., 36187., 54281., 72414., 90470., 111580.],
+    [22615., 45234., 67852., 90470., 113262., 139476.],
+    [27892., 55789., 83685., 111580., 139476., 172860.]
+])
+b = np.array([1. / 6, 5. / 24, 11. / 120, 19. / 720, 29. / 5040, 1. / 840])
+
+# Counts of runs up and down of the rows of x, as udruns() makes them: every step
+# up counts the run down ending before it, 0 after another step up, and every
+# step down the run up before it. The runs at the end are counted as well.
+def udruns(x):
+    up = np.diff(x, axis=1)
+    up = np.where(up == 0, x[:, 1:] > .5, up > 0)
+
+    steps = up.shape[1]
+    index = np.arange(steps)
+    starts = np.maximum.accumulate(np.where(np.diff(up, axis=1, prepend=~up[:, :1]), index, 0), axis=1)
+    run = np.minimum(index - starts + 1, 5)     # length of the run of equal steps ending at every step
+
+    before = np.zeros_like(run)                 # the same for the step before
+    before[:, 1:] = np.where(up[:, 1:] != up[:, :-1], run[:, :-1], 0)
+
+    ucnt = np.zeros((len(x), 6), dtype=np.intp)
+    dcnt = np.zeros((len(x), 6), dtype=np.intp)
+    rows = np.broadcast_to(np.arange(len(x))[:, None], up.shape)
+    np.add.at(dcnt, (rows[up], before[up]), 1)
+    np.add.at(ucnt, (rows[~up], before[~up]), 1)
+
+    last = np.arange(len(x)), run[:, -1]
+    np.add.at(ucnt, (last[0], np.where(up[:, -1], last[1], 0)), 1)
+    np.add.at(dcnt, (last[0], np.where(up[:, -1], 0, last[1])), 1)
+
+    n = x.shape[1]
+    ustat = np.einsum("si,ij,sj->s", ucnt - n * b, a, ucnt - n * b) / n
+    dstat = np.einsum("si,ij,sj->s", dcnt - n * b, a, dcnt - n * b) / n
+    return ustat, dstat
+
+def runs(words):
+    x = uniform(uni(words, no_sets * no_seqs * length)).reshape(no_sets, no_seqs, length)
+
+    p = {}
+    for i, set in enumerate(x):
+        ustat, dstat = udruns(set)
+        p[f"set {i + 1} up"] = KStest(Chisq(6, ustat))
+        p[f"set {i + 1} down"] = KStest(Chisq(6, dstat))
+    return p
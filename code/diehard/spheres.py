@@ -0,0 +1,20 @@
+import numpy as np
+from .stats import uni, UNIMAX, KStest
+from .mindist import min_distance
+
+# 3D spheres, d3sphere.c. 4000 points are placed in a cube of edge 1000. The
+# cube of the minimum distance between them is close to exponential with mean 30.
+# d3sphere.c sorts the x coordinates on their own, without the y and z of their
+# points. The points are then still independent and uniform, only not the ones
+# of the input, and this does the same to give the same p-values.
+
+no_obs, no_pts, edge = 20, 4000, 1000
+
+def spheres(words):
+    points = uni(words, no_obs * no_pts * 3).reshape(no_obs, no_pts, 3) * (edge / UNIMAX)
+    points[:, :, 0].sort(axis=1)
+
+    dmin = min_distance(points)
+    r3 = dmin * np.sqrt(dmin)
+    p = 1 - np.exp(-np.minimum(r3 / 30., 20))
+    return {**{f"sample {i + 1}": v for i, v in enumerate(p)}, "KS": KStest(p)}
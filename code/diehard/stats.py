@@ -0,0 +1,63 @@
+import numpy as np
+from scipy.special import chdtr, ndtr
+
+# Distributions and helpers shared by the tests, following df.c, kstest.c and funct.c
+
+DIM = 4096              # words read by uni() at a time
+UNIMAX = 4294967296.    # 2^32
+
+# The first n words the tests of die-c get from uni(). Every test starts again at
+# the beginning of the input. When the input is too short, uni() keeps the last
+# block it read, with the remaining words of the input copied over its start, and
+# returns that block over and over. Data long enough is returned without a copy.
+def uni(words, n):
+    if n <= len(words):
+        return words[:n]
+
+    full, rest = divmod(len(words), DIM)
+    tail = np.zeros(DIM, dtype=np.uint32)
+    if full > 0:
+        tail[:] = words[(full - 1) * DIM:full * DIM]
+    tail[:rest] = words[full * DIM:]
+
+    repeats = -(-(n - full * DIM) // DIM)
+    return np.concatenate((words[:full * DIM], np.tile(tail, repeats)))[:n]
+
+# Uniform numbers in [0, 1) as uni()/UNIMAX
+def uniform(words):
+    return words / UNIMAX
+
+# c.d.f. of the standard normal
+def Phi(x):
+    return ndtr(x)
+
+# c.d.f. of chi-square with df degrees of freedom
+def Chisq(df, x):
+    return chdtr(df, x)
+
+# p.d.f. of the Poisson distribution
+def Poisson(mean, k):
+    return np.exp(-mean) * mean ** k / np.prod(np.arange(1, k + 1, dtype=float))
+
+# c.d.f. of the Anderson-Darling statistic (the quick approximation of kstest.c)
+def AD(z):
+    z = np.asarray(z, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        return np.select(
+            [z < .01, z <= 2, z <= 4],
+            [
+                0.,
+                2 * np.exp(-1.2337 / z) * (1 + z / 8 - .04958 * z * z / (1.325 + z)) / np.sqrt(z),
+                1 - .6621361 * np.exp(-1.091638 * z) - .95095 * np.exp(-2.005138 * z)
+            ],
+            1 - .4938691 * np.exp(-1.050321 * z) - .5946335 * np.exp(-1.527198 * z)
+        )
+
+# p-value of the Anderson-Darling test of uniformity of the values along the
+# last axis, one per row for a 2-d array
+def KStest(x):
+    x = np.sort(np.asarray(x, dtype=float), axis=-1)
+    dim = x.shape[-1]
+    tmp = np.maximum(1e-20, x * (1 - x[..., ::-1]))
+    z = -dim - (np.arange(1, 2 * dim, 2) * np.log(tmp)).sum(axis=-1) / dim
+    return 1 - AD(z)
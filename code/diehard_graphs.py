@@ -1,7 +1,13 @@
+import argparse
+import os
 import numpy as np
+import pandas as pd
 import matplotlib
 import matplotlib.pyplot as plt
+from functools import lru_cache
 from scipy.interpolate import CubicHermiteSpline
+from diehard.runner import read_results
+from diehard.null import envelope
 
 matplotlib.rcParams.update({
     "backend": "TKAgg",
@@ -19,6 +25,30 @@ matplotlib.rcParams.update({
     "pgf.rcfonts": False
 })
 
+# p-values of the figures of the report, copied from the text reports of die-c into
+# the format of diehard.runner: the sub-tests of every source, and for the tests of
+# the performance figure one row with subtest KS holding the p-value shown there,
+# which for tests without KS is the p-value of the test in that run. The zero
+# p-values the reports only gave as counts are filed under the tests they were
+# counted for. The urandom sources of the two figures are different runs.
+# Results of new runs of diehard.runner can be plotted instead with --results.
+results_path = "data/diehard_results.csv"
+
+# Results of diehard.runner, parsed once for every version of the file
+@lru_cache
+def parsed_results(path, mtime):
+    return read_results(path)
+
+def load_results(path=results_path):
+    return parsed_results(path, os.stat(path).st_mtime_ns)
+
+# One p-value per source and test: the KS test over the sub-tests where there is
+# one, or else the only sub-test. Tests with several sub-tests and no KS are left out.
+def summary(results):
+    single = results.groupby(["source", "test"])["subtest"].transform("size") == 1
+    rows = results[(results["subtest"] == "KS") | single]
+    return rows.pivot_table(index="source", columns="test", values="p_value")
+
 def plot_dataset_composition():
     matplotlib.rcParams.update({
         "axes.spines.bottom": False,
@@ -93,7 +123,10 @@ def plot_dataset_composition():
     
     plt.show()
 
-def plot_test_requirements():
+# Bytes every selection packs into and every test reads, written by code/c++onvert2bin/budget.py
+budget_path = "data/diehard_budget.csv"
+
+def plot_test_requirements(budget=budget_path):
     matplotlib.rcParams.update({
         "axes.spines.bottom": True,
         "axes.spines.left": True,
@@ -104,30 +137,13 @@ def plot_test_requirements():
     # v is in bytes, so * 8 converts to bits and one 1-49 lottery number provides 5 bits
     convert = lambda v: (v * (8/5)) / 1e6   # 1e6 rescales to millions on numbers
 
-    requirements = {
-        "Birthday":                     convert(2048000),
-        "Overlapping 5-Perms":          convert(8011776),
-        "Binary rank 31x31":            convert(4964352),
-        "Binary rank 32x32":            convert(5128192),
-        "Binary rank 6x8":              convert(2408448),
-        "Bitstream":                    convert(5259264),
-        "Monkey OPSO":                  convert(8404992),
-        "Monkey OQSO":                  convert(8404992),
-        "Monkey DNA":                   convert(8404992),
-        "Count 1s":                     convert(1032192),
-        "Parking":                      convert( 966656),
-        "Mindist":                      convert(6406144),
-        "3D spheres":                   convert( 966656),
-        "Squeeze":                      convert(8306688),
-        "Overlapping sums":             convert( 802816),
-        "Runs":                         convert( 802816),
-        "Craps":                        convert(5832704)
-    }
+    budget = pd.read_csv(budget)
+    requirements = budget.drop_duplicates("test").set_index("test")["required"].map(convert).to_dict()
+    sizes = budget.drop_duplicates("selection").set_index("selection")["bytes"].map(convert)
+
+    DC = sizes["DC_Keno"]
+    JC = sizes["JointLotteries"]
 
-    NY = convert(20528177)
-    DC = convert( 4189822)
-    JC = convert( 1453016)
-    
     bar_properties = {
         "width": 1,
         "linewidth": 1,
@@ -193,7 +209,7 @@ def plot_test_requirements():
     plt.show()
 
 # Mask tests where dataset lacks enough bytes 
-def plot_performance():
+def plot_performance(results=results_path):
     matplotlib.rcParams.update({
         "axes.spines.bottom": False,
         "axes.spines.left": False,
@@ -201,27 +217,34 @@ def plot_performance():
         "axes.spines.top": False
     })
 
-    bit_sources = [
-        "/dev/urandom 4M",
-        "/dev/urandom 19M",
-        "Joint lotteries",
-        "DC Keno",
-        "NY Quick Draw"
-    ]
+    # Label of every source in the results
+    bit_sources = {
+        "/dev/urandom 4M": "urandom4M",
+        "/dev/urandom 19M": "urandom19M",
+        "Joint lotteries": "JointLotteries",
+        "DC Keno": "DC_Keno",
+        "NY Quick Draw": "NY_Quick_Draw"
+    }
 
-    performance = np.array([
-        #    Bday,    31x31,    32x32,      6x8, Count 1s,  Parking,  Mindist,  3DSphrs,  Squeeze, OverSums
-        [0.033248,    0.329,    0.001, 0.554153, 0.301102,       0.,       0., 0.944090,       0., 0.840705], # /dev/urandom 4M
-        [0.100870,    0.647,    0.193, 0.428252, 0.057863,       0., 0.375738, 0.196550, 0.105024, 0.000958], # /dev/urandom 19M
-        [      0.,       0.,       0.,       0.,       0.,       1.,       0., 0.032128,       0.,       0.], # Joint lotteries
-        [      0.,    0.241,       0.,       0.,       0.,       1.,       0., 0.231590,       0.,       0.], # DC Keno
-        [      0.,    0.260,    0.497,       0.,       0.,       0.,       0.,       0.,       0.,       0.]  # NY Quick Draw
-    ])
-
-    tests = [
-        "Birthday", "Rank 31x31", "Rank 32x32", "Rank 6x8", "Count 1s",
-        "Parking", "Mindist", "3D spheres", "Squeeze", "OverSums"
-    ]
+    # Label of every test in the results
+    tests = {
+        "Birthday": "Birthday",
+        "Rank 31x31": "Binary rank 31x31",
+        "Rank 32x32": "Binary rank 32x32",
+        "Rank 6x8": "Binary rank 6x8",
+        "Count 1s": "Count 1s stream",
+        "Parking": "Parking",
+        "Mindist": "Mindist",
+        "3D spheres": "3D spheres",
+        "Squeeze": "Squeeze",
+        "OverSums": "Overlapping sums"
+    }
+
+    performance = summary(load_results(results)).reindex(
+        index=list(bit_sources.values()),
+        columns=list(tests.values())
+    ).fillna(0.).to_numpy()
+    bit_sources, tests = list(bit_sources), list(tests)
 
     def modify_axis(ax, test, x_position):
         epsilon = 0.05
@@ -285,7 +308,9 @@ def plot_performance():
 
     plt.show()
 
-def plot_pvalue_distributions():
+# With null, results of python -m diehard.null, the 95% envelope of every source is
+# drawn around its p-values
+def plot_pvalue_distributions(results=results_path, null=None):
     matplotlib.rcParams.update({
         "axes.spines.bottom": True,
         "axes.spines.left": True,
@@ -294,90 +319,19 @@ def plot_pvalue_distributions():
     })
 
     bit_sources = [
-        ("/dev/urandom 15M", {"color": u'#9467bd'}),
-        ("/dev/urandom 3M",  {"color": u'#d62728'}),
-        ("NY Quick Draw",    {"color": "forestgreen"}),
-        ("Joint Lotteries",  {"color": "navy"}),
-        ("DC Keno",          {"color": "gold"})
+        ("/dev/urandom 15M", "urandom15M",     {"color": u'#9467bd'}),
+        ("/dev/urandom 3M",  "urandom3M",      {"color": u'#d62728'}),
+        ("NY Quick Draw",    "NY_Quick_Draw",  {"color": "forestgreen"}),
+        ("Joint Lotteries",  "JointLotteries", {"color": "navy"}),
+        ("DC Keno",          "DC_Keno",        {"color": "gold"})
     ]
 
+    # All p-values of every source, without the KS tests summarizing them
+    results = load_results(results)
+    results = results[results["subtest"] != "KS"]
     p_values = [
-        np.array(   # /dev/urandom 15M
-              [0.403685, 0.082346, 0.724733, 0.145476, 0.207411, 0.659017, 0.579853, 0.313638, 0.669233]  # Birthdays
-            + [0.654]   # Rank 31x31
-            + [0.524]   # Rank 32x32
-            + [0.057827, 0.007909, 0.471677, 0.921250, 0.589605, 0.865652, 0.176497, 0.637568,
-               0.020626, 0.203003, 0.758697, 0.571092, 0.078719, 0.568228, 0.508636, 0.571082,
-               0.277021, 0.291555, 0.048458, 0.491945, 0.249113, 0.050382, 0.634230, 0.811666, 0.737854]    # Rank 6x8
-            + [0.863073, 0.677619, 0.218501, 0.411562, 0.060215, 0.847665, 0.045884, 0.021922, 0.672574, 0.583576,
-               0.929589, 0.972655, 0.743006, 0.358908, 0.632024, 0.515218, 0.092752, 0.882061, 0.652949, 0.494715]  # Bitstream
-            + [0.411768, 0.889764, 0.386475, 0.029710, 0.337406, 0.597145, 0.453785, 0.477080, 0.072017, 0.342460, 0.429294, 0.842452,
-               0.434716, 0.739731, 0.108082, 0.587776, 0.233782, 0.575656, 0.658376, 0.782436, 0.034152, 0.459255, 0.049060]    # Monkey OPSO
-            + [0.326453, 0.703095, 0.666994, 0.575717, 0.441158, 0.666994, 0.603391, 0.609910, 0.199628, 0.784523,
-               0.347491, 0.925320, 0.602084, 0.052336, 0.563733, 0.253573, 0.821152, 0.407966, 0.358828, 0.034439,
-               0.673131, 0.634386, 0.449195, 0.044831, 0.032176, 0.935715, 0.607306, 0.701920]  # Monkey OQSO
-            + [0.427824, 0.013101, 0.927200, 0.577563, 0.999669, 0.431299, 0.725678, 0.728619, 0.420890, 0.125181, 0.862026,
-               0.399105, 0.552020, 0.741181, 0.681875, 0.521561, 0.305253, 0.945829, 0.614114, 0.391154, 0.356527,
-               0.411684, 0.425510, 0.237957, 0.475690, 0.150469, 0.425510, 0.439428, 0.386630, 0.976496, 0.084774]  # Monkey DNA
-            + [0.752158]    # Count 1s
-            + [0.343080, 0.337851, 0.872838, 0.486210, 0.900146, 0.981836, 0.860178, 0.953276, 0.357450,
-               0.980800, 0.993092, 0.620926, 0.313547, 0.951391, 0.525591, 0.055784, 0.191794, 0.045231,
-               0.578388, 0.956640, 0.171971, 0.767922, 0.462354, 0.096067, 0.560090]    # Count 1s stream
-            + [0.807188, 0.307734, 0.392053, 0.590298, 0.168804, 0.723613, 0.767486, 0.157553, 0.984068, 0.126820]  # Parking
-            + [0.483051, 0.449288, 0.795696, 0.066104, 0.701655, 0.564695, 0.980632, 0.535848, 0.201702, 0.922340,
-               0.024349, 0.555208, 0.064886, 0.098087, 0.601509, 0.983688, 0.908297, 0.788827, 0.541362, 0.412745]  # Mindist
-            + [0.390534, 0.015193, 0.749144, 0.358539, 0.050641, 0.916139, 0.875968, 0.316776, 0.674583, 0.069724,
-               0.117909, 0.310243, 0.350934, 0.751197, 0.895716, 0.105824, 0.268205, 0.937833, 0.641028, 0.533467]  # 3D Spheres
-            + [0.867679]    # Squeeze
-            + [0.976108, 0.082778, 0.827780, 0.308613, 0.063533, 0.090693, 0.131835, 0.138024, 0.311349, 0.065625]  # Overlapping sums
-            + [0.818870, 0.263975, 0.034056, 0.935695]  # Runs
-            + [0.172496, 0.561812]  # Craps
-        ),
-        np.array(   # /dev/urandom 3M
-            [0.348718, 0.111287, 0.184292, 0.620304, 0.550322, 0.941748, 0.311596, 0.859726, 0.443114]    # Birthdays
-            + [0.043581, 0.390324, 0.716402, 0.057192, 0.015145, 0.921085, 0.607242, 0.580108, 0.062324, 0.148309,
-               0.925389, 0.551145, 0.640269, 0.807229, 0.406862, 0.407707, 0.727363, 0.720685, 0.092005, 0.580141,
-               0.250703, 0.986889, 0.627056, 0.261831, 0.218085]    # Rank 6x8
-            + [0.686100]    # Count 1s
-            + [0.118983, 0.835505, 0.463574, 0.659615, 0.988854, 0.403083, 0.131870, 0.561444, 0.917328, 0.760479,
-               0.458941, 0.841077, 0.884443, 0.586755, 0.280323, 0.587651, 0.959726, 0.927346, 0.657893, 0.502601,
-               0.303784, 0.501667, 0.168551, 0.227245, 0.517251]    # Count 1s Stream
-            + [0.676028, 0.357445, 0.980051, 0.590298, 0.291865, 0.842447, 0.192812, 0.831196, 0.427537, 0.392053]  # Parking
-            + [0.450357, 0.982956, 0.154505, 0.693506, 0.938720, 0.484377, 0.412830, 0.697878, 0.276081, 0.475469,
-               0.950946, 0.711610, 0.837260, 0.727367, 0.762694, 0.884349, 0.965807, 0.238359, 0.415582, 0.530474]  # 3D Spheres
-            + [0.469496, 0.213569, 0.792062, 0.908212, 0.940481, 0.811764, 0.918508, 0.296839, 0.593965, 0.401768]  # Overlapping Sums
-            + [0.496771, 0.187828, 0.576015, 0.846748]  # Runs
-        ),
-        np.array(   # NY Quick Draw
-            [0.] * (9 + 19 + 25 + 23 + 28 + 31 + 1 + 3 + 1 + 3)    # All Birthdays, All Rank 6x8, all Bitstream, all Monkey, Count 1s, 3 Mindist, Squeeze, 3 Runs, 1 Craps
-            + [0.864]   # Rank 31x31
-            + [0.954]   # Rank 32x32
-            + [0.000000, 0.000172, 0.000002, 0.000202, 0.000005, 0.000033, 0.000050, 0.000054, 0.000383, 0.000000,
-               0.000031, 0.000120, 0.000840, 0.000464, 0.000024, 0.000047, 0.000060, 0.000000, 0.000003, 0.000008]  # Mindist
-            + [0.000423, 0.001766, 0.001634, 0.000031, 0.000034, 0.010907, 0.000119, 0.000587, 0.000614, 0.000002,
-               0.000022, 0.000537, 0.000367, 0.000566, 0.000032, 0.000880, 0.000547, 0.000879, 0.000548, 0.000070]  # 3D Spheres
-            + [0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000, 0.000000]  # Overlapping sums
-            + [0.000001]
-            + [1.] * (10 + 1) # All Parking, 1 Craps
-        ),
-        np.array(   # Joint lotteries
-            [0.] * 1   # Collective number of zero p-values collected across all tests
-            + [0.899470, 0.205562, 0.781201, 0.999989, 1.000000, 0.999997, 1.000000, 1.000000, 1.000000, 1.000000]    # Parking
-            + [0.166952, 0.533278, 0.018036, 0.124910, 0.724003, 0.483606, 0.111519, 0.206068, 0.000068, 0.000008,
-               0.000155, 0.813621, 0.033500, 0.000468, 0.000606, 0.000003, 0.018697, 0.001056, 0.000710, 0.000195]  # 3D Spheres
-            + [0.000249, 0.151731, 0.392932, 0.007543, 0.417294, 0.772924, 0.008993, 0.125059, 0.000000, 0.000000]  # Overlapping sums
-            + [0.981149, 0.904974, 0.000000, 0.000000]  # Runs
-        ),
-        np.array(   # DC Keno
-            [0.] * 26   # All Rank 6x8, Count 1s
-            + [0.541271, 0.068902, 0.530540, 0.946908, 0.825604, 0.562559, 0.104863, 0.899733, 0.197744]    # Birthday
-            + [0.882429, 0.958644, 0.831196, 0.642555, 0.863437, 0.944998, 0.676028, 0.374623, 0.767486, 0.999186]    # Parking
-            + [0.614374, 0.587119, 0.095097, 0.190983, 0.649011, 0.398152, 0.816170, 0.008576, 0.319404, 0.076079,
-               0.769168, 0.057085, 0.516542, 0.537590, 0.148601, 0.314576, 0.370156, 0.933385, 0.394321, 0.436331]  # 3D Spheres
-            + [0.000000, 0.000000, 0.000000, 0.000001, 0.000220, 0.000000, 0.000000, 0.000000, 0.002348, 0.000108]  # Overlapping RUns
-            + [0.274252, 0.697789, 0.319506, 0.442761]  # Runs
-            + [1.] * 2
-        )        
+        results.loc[results["source"] == source, "p_value"].to_numpy(copy=True)
+        for _, source, _ in bit_sources
     ]
 
     fig, ax = plt.subplots(figsize=(6, 6))
@@ -401,11 +355,20 @@ def plot_pvalue_distributions():
     
     artists = []
     ax.plot([0, 1], [0, 1], color="gray")
-    for source, (name, kwargs) in zip(p_values, bit_sources):
+    for source, (name, _, kwargs) in zip(p_values, bit_sources):
         source.sort()
         xaxis = np.linspace(0, 1, num=len(source), endpoint=True)
         artist, = ax.plot(xaxis, source, label=name, linewidth=2, zorder=6, **kwargs)
         artists.append(artist)
+
+    if null is not None:
+        null = load_results(null)
+        for name, key, kwargs in bit_sources:
+            if key not in set(null["source"]):
+                continue
+            low, high = envelope(null, key)
+            xaxis = np.linspace(0, 1, num=len(low), endpoint=True)
+            ax.fill_between(xaxis, low, high, alpha=0.2, linewidth=0, zorder=5, **kwargs)
     
     ax.legend(
         ncol=1,
@@ -419,7 +382,14 @@ def plot_pvalue_distributions():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--results", default=results_path,
+                        help="results of python -m diehard.runner, the p-values of the report by default")
+    parser.add_argument("--null", help="null runs of python -m diehard.null, drawn as envelopes")
+    parser.add_argument("--budget", default=budget_path, help="byte budget of code/c++onvert2bin/budget.py")
+    args = parser.parse_args()
+
     # plot_dataset_composition()
-    plot_test_requirements()
-    # plot_performance()
-    # plot_pvalue_distributions()
+    plot_test_requirements(args.budget)
+    # plot_performance(args.results)
+    # plot_pvalue_distributions(args.results, args.null)
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The modules of c++onvert2bin are imported by their file names like when running
+# them as scripts, and diehard as a package from code/
+code = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(code, "c++onvert2bin"), code]
@@ -0,0 +1,41 @@
+import io
+import os
+import shutil
+import subprocess
+import numpy as np
+import pytest
+from packing import pack, stream_writer
+
+# numbers.bin is the output of txt2bin for numbers.txt, which has numbers above 64
+# to be skipped and zeros whose upper bits txt2bin carries into the next number.
+# txt2bin is built from its source for the comparison, as the binary in the
+# repository is older than txt2bin.cpp and packs zeros differently.
+fixtures = os.path.join(os.path.dirname(__file__), "fixtures")
+source = os.path.join(os.path.dirname(os.path.dirname(__file__)), "c++onvert2bin", "txt2bin.cpp")
+compiler = shutil.which("c++") or shutil.which("g++")
+
+def fixture():
+    numbers = np.loadtxt(os.path.join(fixtures, "numbers.txt"), dtype=np.int64)
+    with open(os.path.join(fixtures, "numbers.bin"), "rb") as f:
+        return numbers, f.read()
+
+def test_pack():
+    numbers, expected = fixture()
+    assert pack(numbers).tobytes() == expected
+
+@pytest.mark.parametrize("chunk", [1, 7, 64, 1000])
+def test_stream_writer(chunk):
+    numbers, expected = fixture()
+    out = io.BytesIO()
+    writer = stream_writer(out)
+    for start in range(0, len(numbers), chunk):
+        writer.write(numbers[start:start + chunk])
+    assert out.getvalue() == expected
+
+@pytest.mark.skipif(compiler is None, reason="no C++ compiler to build txt2bin")
+def test_txt2bin(tmp_path):
+    _, expected = fixture()
+    shutil.copy(os.path.join(fixtures, "numbers.txt"), tmp_path)
+    subprocess.run([compiler, "-O2", "-o", "txt2bin", source], cwd=tmp_path, check=True)
+    subprocess.run(["./txt2bin", "numbers.txt", "numbers.bin"], cwd=tmp_path, check=True, capture_output=True)
+    assert (tmp_path / "numbers.bin").read_bytes() == expected
@@ -0,0 +1,20 @@
+import json
+import numpy as np
+from json2txt import dataset, read
+from store import ingest, query, numbers
+
+# A draw whose date can't be parsed goes to the partition of year -1, which used to
+# be a null partition no query of the store could read
+def test_unparsed_dates(tmp_path):
+    source = tmp_path / "Lottonumbers_complete.json"
+    source.write_text(json.dumps({"data": [
+        {"date": "01.02.2003", "Lottozahl": [1, 2, 3, 4, 5, 6]},
+        {"date": "bad", "Lottozahl": [7, 8, 9, 10, 11, 12]}
+    ]}))
+    lotto = dataset(str(source), [], "A32", (1, 49), date_format="%d.%m.%Y", picks=6)
+    ingest([lotto], str(tmp_path / "store"))
+
+    frame = query(path=str(tmp_path / "store"))
+    assert frame["year"].astype(int).tolist() == [2003] * 6 + [-1] * 6
+    assert np.array_equal(numbers(frame), read(lotto))
+    assert numbers(query([("year", "==", -1)], path=str(tmp_path / "store"))).tolist() == [7, 8, 9, 10, 11, 12]